@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from .embeddings import EmbeddingService
 from .parsing import ResumeData, parse_job_description, parse_resume_pdf
-from .scoring import compute_match_score, top_k_matches
+from .scoring import as_vector, compute_match_score, top_k_matches
 from .vectorstore import create_vector_store, create_vector_store_for
 import numpy as np
 
@@ -15,6 +16,9 @@ try:
 except Exception:
     ChatGoogleGenerativeAI = None  # type: ignore
 
+# Background writer for vector-store records the agent result does not depend on
+_PERSIST_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vector-persist")
+
 
 @dataclass
 class AgentResult:
@@ -91,6 +95,40 @@ def content_enhancer_agent(resume_text: str) -> AgentResult:
     )
 
 
+def _persist_match_vectors(
+    resume_text: str,
+    job_text: str,
+    resume_vec: np.ndarray,
+    job_vec: np.ndarray,
+    score: float,
+) -> None:
+    """Persist the holistic resume and job vectors too, and a match record"""
+    try:
+        resume_store = create_vector_store_for(collection_name="resumes", dimension=len(resume_vec))
+        job_store = create_vector_store_for(collection_name="jobs", dimension=len(job_vec))
+        match_store = create_vector_store_for(collection_name="matches", dimension=len(job_vec))
+
+        resume_store.add_texts(
+            texts=[resume_text],
+            vectors=resume_vec[np.newaxis, :],
+            metadatas=[{"type": "resume"}],
+        )
+        job_store.add_texts(
+            texts=[job_text],
+            vectors=job_vec[np.newaxis, :],
+            metadatas=[{"type": "job"}],
+        )
+        # store a small summary doc embedding equal to the job vector for quick reverse lookups
+        match_summary = f"Match score {score:.1f}%"
+        match_store.add_texts(
+            texts=[match_summary],
+            vectors=job_vec[np.newaxis, :],
+            metadatas=[{"type": "match", "resume_len": len(resume_text), "job_len": len(job_text)}],
+        )
+    except Exception:
+        pass
+
+
 def matcher_and_scoring_agent(
     resume_text: str,
     job_text: str,
@@ -98,14 +136,15 @@ def matcher_and_scoring_agent(
     job_skills: List[str],
     embedding_service: EmbeddingService,
 ) -> AgentResult:
-    texts = [resume_text, job_text]
-    vecs = embedding_service.embed_texts(texts)
-    resume_vec, job_vec = vecs[0], vecs[1]
-
-    resume_snippets = [s for s in resume_text.split("\n") if len(s.strip()) > 20][:20]
+    # Repeated lines (section headers, bullet stems) are embedded and ranked once
+    resume_snippets = list(dict.fromkeys(s for s in map(str.strip, resume_text.split("\n")) if len(s) > 20))[:20]
     if not resume_snippets:
         resume_snippets = [resume_text[:300]]
-    snippet_vecs = embedding_service.embed_texts(resume_snippets)
+
+    # Embed both documents and all snippets in one backend call, converting once
+    # at the boundary; scoring and the vector stores share these arrays
+    vecs = as_vector(embedding_service.embed_texts([resume_text, job_text, *resume_snippets]))
+    resume_vec, job_vec, snippet_vecs = vecs[0], vecs[1], vecs[2:]
 
     # Persist snippet embeddings in the configured vector store and retrieve top matches
     try:
@@ -113,42 +152,20 @@ def matcher_and_scoring_agent(
         metas = [{"i": i} for i in range(len(resume_snippets))]
         store.add_texts(
             texts=resume_snippets,
-            vectors=np.array(snippet_vecs, dtype=np.float32),
+            vectors=snippet_vecs,
             metadatas=metas,
         )
-        store_results = store.similarity_search(np.array(job_vec, dtype=np.float32), k=5)
+        store_results = store.similarity_search(job_vec, k=5)
         top_snips = [(text, float(score)) for text, score, _ in store_results]
     except Exception:
         # Fallback to in-memory similarity if vector store is unavailable
         top_snips = top_k_matches(job_vec, resume_snippets, snippet_vecs, k=5)
 
-    # Persist the holistic resume and job vectors too, and a match record
-    try:
-        resume_store = create_vector_store_for(collection_name="resumes", dimension=len(resume_vec))
-        job_store = create_vector_store_for(collection_name="jobs", dimension=len(job_vec))
-        match_store = create_vector_store_for(collection_name="matches", dimension=len(job_vec))
-
-        resume_store.add_texts(
-            texts=[resume_text],
-            vectors=np.array([resume_vec], dtype=np.float32),
-            metadatas=[{"type": "resume"}],
-        )
-        job_store.add_texts(
-            texts=[job_text],
-            vectors=np.array([job_vec], dtype=np.float32),
-            metadatas=[{"type": "job"}],
-        )
-        # store a small summary doc embedding equal to the job vector for quick reverse lookups
-        match_summary = f"Match score {compute_match_score(resume_vec, job_vec, resume_skills, job_skills)['score']:.1f}%"
-        match_store.add_texts(
-            texts=[match_summary],
-            vectors=np.array([job_vec], dtype=np.float32),
-            metadatas=[{"type": "match", "resume_len": len(resume_text), "job_len": len(job_text)}],
-        )
-    except Exception:
-        pass
     scoring = compute_match_score(resume_vec, job_vec, resume_skills, job_skills)
 
+    # Persisting the holistic vectors does not affect the result, so it runs off the request path
+    _PERSIST_POOL.submit(_persist_match_vectors, resume_text, job_text, resume_vec, job_vec, scoring["score"])
+
     outputs: Dict[str, Any] = {
         "score": scoring["score"],
         "confidence": scoring["confidence"],
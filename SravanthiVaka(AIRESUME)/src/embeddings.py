@@ -3,7 +3,11 @@ from __future__ import annotations
 import hashlib
 import os
 import re
-from typing import Iterable, List
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List
 
 import numpy as np
 
@@ -14,6 +18,8 @@ except Exception:
 
 
 DEFAULT_GEMINI_EMBED_MODEL = os.getenv("GEMINI_EMBED_MODEL", "text-embedding-004")
+_EMBED_CACHE_PATH = Path("~/.cache/airesume/embeddings.db").expanduser()
+_EMBED_MEMORY_CAP = 4096
 
 
 class _LocalHashingEmbeddings:
@@ -78,6 +84,8 @@ class EmbeddingService:
         # Fallback to local hashing embeddings
         if self._backend is None:
             self._backend = _LocalHashingEmbeddings(dimension=768)
+            model_name = "local-hashing-768"
+        self.model_id = model_name
 
     @property
     def dimension(self) -> int:
@@ -92,3 +100,80 @@ class EmbeddingService:
 
     def embed_query(self, text: str) -> List[float]:
         return self.embed_texts([text])[0]
+
+    def warmup(self) -> None:
+        """Embed one short text straight through the backend so client and
+        connection setup happen before the first real request."""
+        try:
+            self._backend.embed_documents(["warmup"])  # type: ignore[attr-defined]
+        except Exception:
+            pass
+
+
+class CachedEmbeddingService(EmbeddingService):
+    """EmbeddingService that remembers vectors per text, in memory and in a SQLite file.
+
+    Keys are a 128-bit BLAKE2b of the model id and the stripped text, so switching
+    models never returns stale vectors. Safe to share across Streamlit sessions.
+    """
+
+    def __init__(self, path: Path = _EMBED_CACHE_PATH) -> None:
+        super().__init__()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)")
+        except (OSError, sqlite3.Error):
+            self._db = None
+
+    def _key(self, text: str) -> str:
+        return hashlib.blake2b(f"{self.model_id}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def embed_texts(self, texts: Iterable[str]) -> List[List[float]]:
+        clean_texts: List[str] = [t.strip() if t else "" for t in texts]
+        keys = [self._key(t) for t in clean_texts]
+
+        with self._lock:
+            found = {k: self._memory[k] for k in keys if k in self._memory}
+            for k in found:
+                self._memory.move_to_end(k)
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            if missing and self._db is not None:
+                try:
+                    rows = self._db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(missing))})", missing
+                    ).fetchall()
+                except sqlite3.Error:
+                    rows = []
+                for k, blob in rows:
+                    found[k] = np.frombuffer(blob, dtype=np.float32)
+
+        # Embed the remaining texts in one batched backend call
+        todo = {k: t for k, t in zip(keys, clean_texts) if k not in found}
+        fresh: Dict[str, np.ndarray] = {}
+        if todo:
+            vectors = super().embed_texts(todo.values())
+            fresh = {k: np.asarray(v, dtype=np.float32) for k, v in zip(todo, vectors)}
+            found.update(fresh)
+
+        with self._lock:
+            # Least recently used vectors are evicted first; hot ones stay in memory
+            for k, v in found.items():
+                self._memory[k] = v
+                self._memory.move_to_end(k)
+            while len(self._memory) > _EMBED_MEMORY_CAP:
+                self._memory.popitem(last=False)
+            if fresh and self._db is not None:
+                try:
+                    with self._db:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                            [(k, v.tobytes()) for k, v in fresh.items()],
+                        )
+                except sqlite3.Error:
+                    pass
+
+        return [found[k].tolist() for k in keys]
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 import io
 import base64
+import hashlib
+import json
 import re
+import threading
+from string import Template
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Any, Dict, List, Tuple, Optional, Union
-from PIL import Image
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Optional, Union
+from jinja2 import Environment
 
 # Try WeasyPrint first (preferred on systems with GTK/Pango/Cairo)
 try:
@@ -16,6 +24,378 @@ except Exception:
     CSS = None  # type: ignore
     _HAS_WEASYPRINT = False
 
+# Recompress embedded images and subset fonts, keeping only the options this
+# WeasyPrint version understands (DEFAULT_OPTIONS exists from v59 on)
+_PDF_OPTIONS: Dict[str, Any] = {}
+if _HAS_WEASYPRINT:
+    try:
+        from weasyprint import DEFAULT_OPTIONS  # type: ignore
+        _PDF_OPTIONS = {
+            k: v
+            for k, v in {"optimize_images": True, "jpeg_quality": 85, "full_fonts": False, "hinting": False}.items()
+            if k in DEFAULT_OPTIONS
+        }
+    except ImportError:
+        pass
+
+# ReportLab fallback, imported once here rather than on every render
+try:
+    from reportlab.lib import colors  # type: ignore
+    from reportlab.lib.enums import TA_CENTER  # type: ignore
+    from reportlab.lib.pagesizes import A4  # type: ignore
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # type: ignore
+    from reportlab.platypus import Image as ReportLabImage  # type: ignore
+    from reportlab.platypus import ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle  # type: ignore
+    _HAS_REPORTLAB = True
+except Exception:
+    ReportLabImage = None  # type: ignore
+    _HAS_REPORTLAB = False
+
+# Static stylesheet for the ATS resume, parsed once instead of on every render
+_ATS_CSS_TEXT = """
+* {
+  margin: 0;
+  padding: 0;
+  box-sizing: border-box;
+}
+
+body { 
+  font-family: 'Arial', sans-serif; 
+  line-height: 1.6;
+  color: #333;
+  font-size: 11pt;
+  background: white;
+}
+
+.container {
+  max-width: 8.5in;
+  margin: 0 auto;
+  padding: 0.75in;
+  background: white;
+}
+
+/* Photo Section - Enhanced */
+.photo-container {
+  text-align: center;
+  margin-bottom: 25px;
+  width: 100%;
+}
+
+.profile-photo {
+  width: 120px !important;
+  height: 120px !important;
+  border-radius: 50%;
+  object-fit: cover;
+  border: 4px solid #2c3e50;
+  box-shadow: 0 6px 12px rgba(0,0,0,0.15);
+  display: inline-block;
+  background: white;
+}
+
+.photo-placeholder {
+  width: 120px;
+  height: 120px;
+  border-radius: 50%;
+  background: linear-gradient(135deg, #ecf0f1 0%, #d5dbdb 100%);
+  display: inline-block;
+  line-height: 112px;
+  text-align: center;
+  color: #7f8c8d;
+  font-weight: bold;
+  border: 4px solid #2c3e50;
+  font-size: 14px;
+  box-shadow: 0 6px 12px rgba(0,0,0,0.15);
+}
+
+/* Header Section */
+.header {
+  text-align: center;
+  margin-bottom: 30px;
+  padding-bottom: 20px;
+  border-bottom: 3px solid #2c3e50;
+}
+
+h1 { 
+  font-size: 28pt;
+  font-weight: bold;
+  color: #2c3e50;
+  margin-bottom: 12px;
+  letter-spacing: 1px;
+}
+
+.contact-info {
+  font-size: 10pt;
+  color: #555;
+  line-height: 1.5;
+  margin-top: 8px;
+}
+
+.contact-link {
+  color: #2980b9;
+  text-decoration: none;
+}
+
+.contact-link:hover {
+  text-decoration: underline;
+}
+
+.contact-item {
+  color: #555;
+}
+
+/* Section Headers */
+h2 { 
+  font-size: 14pt;
+  font-weight: bold;
+  color: #2c3e50;
+  margin: 25px 0 15px 0;
+  padding-bottom: 5px;
+  border-bottom: 2px solid #bdc3c7;
+  text-transform: uppercase;
+  letter-spacing: 1px;
+}
+
+/* Summary Section */
+.summary {
+  font-size: 11pt;
+  line-height: 1.7;
+  color: #444;
+  text-align: justify;
+  margin-bottom: 20px;
+  padding: 10px;
+  background: #f8f9fa;
+  border-left: 4px solid #3498db;
+}
+
+/* Skills Section */
+.skills-container {
+  margin-bottom: 20px;
+}
+
+.skill-category {
+  margin-bottom: 10px;
+  font-size: 11pt;
+  line-height: 1.6;
+  padding: 5px 0;
+}
+
+.skill-category strong {
+  color: #2c3e50;
+  font-weight: bold;
+}
+
+/* Experience & Education Items */
+.experience-item, .education-item, .project-item {
+  margin-bottom: 25px;
+  page-break-inside: avoid;
+  padding: 10px 0;
+  border-bottom: 1px solid #ecf0f1;
+}
+
+.item-header {
+  margin-bottom: 6px;
+  overflow: hidden;
+}
+
+.item-title {
+  display: inline;
+  font-size: 12pt;
+  font-weight: bold;
+  color: #2c3e50;
+  margin: 0;
+}
+
+.item-date {
+  float: right;
+  font-size: 10pt;
+  color: #7f8c8d;
+  font-weight: normal;
+  white-space: nowrap;
+  margin-left: 15px;
+  font-style: italic;
+}
+
+.item-location {
+  font-size: 10pt;
+  color: #7f8c8d;
+  font-style: italic;
+  margin-bottom: 10px;
+}
+
+/* Bullet Lists */
+.bullet-list {
+  margin: 12px 0 0 20px;
+  padding: 0;
+}
+
+.bullet-list li {
+  margin-bottom: 8px;
+  line-height: 1.6;
+  color: #444;
+  font-size: 11pt;
+}
+
+/* Projects */
+.project-desc {
+  margin: 10px 0;
+  color: #444;
+  line-height: 1.6;
+  font-size: 11pt;
+}
+
+.tech-stack {
+  margin-top: 10px;
+  padding: 8px 12px;
+  background: #f8f9fa;
+  border-left: 4px solid #2980b9;
+  font-size: 10pt;
+  color: #555;
+  border-radius: 0 4px 4px 0;
+}
+
+/* Page breaks */
+.section {
+  page-break-inside: avoid;
+}
+
+/* Print optimizations */
+@media print {
+  .container {
+    padding: 0.5in;
+  }
+  
+  .profile-photo, .photo-placeholder {
+    width: 100px !important;
+    height: 100px !important;
+  }
+  
+  h1 {
+    font-size: 24pt;
+  }
+  
+  .photo-container {
+    margin-bottom: 20px;
+  }
+}
+
+/* Page layout */
+@page {
+  size: A4;
+  margin: 0.6in;
+}
+"""
+_ATS_CSS = CSS(string=_ATS_CSS_TEXT) if _HAS_WEASYPRINT else None
+
+# Stable URL the ATS resume uses for the profile photo; served by _photo_url_fetcher
+_PHOTO_URL = "photo://current"
+
+
+def _photo_url_fetcher(photo: Optional[PhotoAsset]):
+    """WeasyPrint url_fetcher that serves the resume photo from memory"""
+    try:
+        # Newer WeasyPrint expects a URLFetcher instance
+        from weasyprint.urls import URLFetcher, URLFetcherResponse  # type: ignore
+    except ImportError:
+        from weasyprint import default_url_fetcher  # type: ignore
+
+        def fetcher(url, *args, **kwargs):
+            if url == _PHOTO_URL and photo is not None:
+                return {"mime_type": photo.mime, "string": photo.raw_bytes}
+            return default_url_fetcher(url, *args, **kwargs)
+        return fetcher
+
+    class PhotoFetcher(URLFetcher):
+        def fetch(self, url, headers=None):
+            if url == _PHOTO_URL and photo is not None:
+                return URLFetcherResponse(url, photo.raw_bytes, {"Content-Type": photo.mime})
+            return super().fetch(url, headers)
+    return PhotoFetcher()
+
+# Optional Aho-Corasick matcher for long job-requirement lists
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None  # type: ignore
+
+# HTML templates are compiled once at import; autoescape keeps user text from breaking the markup
+_ENV = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+_REPORT_TEMPLATE = _ENV.from_string("""
+<html>
+  <head>
+    <meta charset='utf-8' />
+    <style>
+      body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 24px; color: #333; line-height: 1.6; }
+      h1 { margin: 0 0 8px; color: #2c3e50; font-size: 24pt; }
+      h2 { margin: 20px 0 12px; color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 4px; font-size: 16pt; }
+      h3 { margin: 16px 0 8px; color: #2c3e50; font-size: 14pt; }
+      .meta p { margin: 2px 0; font-size: 12pt; }
+      table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+      th, td { border: 1px solid #ddd; padding: 12px 8px; }
+      th { background: #f8f9fa; text-align: left; font-weight: 600; }
+      .score { color: #27ae60; font-size: 1.2em; font-weight: bold; }
+
+      /* Gap Analysis Styles */
+      .gap-list { margin: 10px 0; padding-left: 20px; }
+      .gap-list li { margin: 8px 0; padding: 8px; border-radius: 4px; }
+      .gap-high { background: #fff5f5; border-left: 4px solid #e53e3e; }
+      .gap-medium { background: #fffaf0; border-left: 4px solid #dd6b20; }
+      .gap-low { background: #f7fafc; border-left: 4px solid #4299e1; }
+      .no-gaps { color: #38a169; font-style: italic; }
+
+      .assessment-positive { color: #38a169; font-weight: bold; padding: 10px; background: #f0fff4; border-radius: 4px; }
+      .assessment-concern { color: #e53e3e; font-weight: bold; padding: 10px; background: #fff5f5; border-radius: 4px; }
+      .assessment-moderate { color: #dd6b20; font-weight: bold; padding: 10px; background: #fffaf0; border-radius: 4px; }
+
+      @page { size: A4; margin: 24pt; }
+    </style>
+  </head>
+  <body>
+    <h1>Resume–Job Match Report</h1>
+    <div class='meta'>
+      <p>Candidate: <b>{{ candidate_name }}</b></p>
+      <p>Match Score: <b class='score'>{{ '%.1f' % match_score }}%</b></p>
+      <p>Confidence: <b>{{ '%.2f' % confidence }}</b></p>
+      <p>Generated: <b>{{ generated }}</b></p>
+    </div>
+
+    <h2>Explanation</h2>
+    <p>{{ explanation }}</p>
+
+    {% if missing_skills %}
+    <h2>Missing/Gap Skills</h2><p>{{ missing_skills | join(', ') }}</p>
+    {% endif %}
+
+    {% if gap_analysis %}
+    <h2>Gap Analysis</h2>
+    {% for gap_type, gaps in gap_analysis.items() if gaps and gap_type != 'overall_assessment' %}
+    <h3>{{ gap_type.replace('_', ' ').title() }}</h3>
+    <ul class='gap-list'>
+      {% for gap in gaps %}
+      <li class='gap-{{ gap.get('severity', 'medium') }}'><strong>{{ gap.get('type', '').replace('_', ' ').title() }}:</strong> {{ gap.get('description', '') }}</li>
+      {% endfor %}
+    </ul>
+    {% endfor %}
+    {% if gap_analysis.get('overall_assessment') %}
+    <h3>Overall Assessment</h3>
+    {% for assessment in gap_analysis['overall_assessment'] %}
+    <p class='assessment-{{ assessment.get('type', 'moderate') }}'>{{ assessment.get('description', '') }}</p>
+    {% endfor %}
+    {% endif %}
+    {% endif %}
+
+    {% if top_snippets %}
+    <h2>Top Matching Resume Snippets</h2>
+    <table><thead><tr><th>Snippet</th><th>Similarity</th></tr></thead><tbody>
+      {% for text, sim in top_snippets %}
+      <tr><td>{{ text[:120] }}{{ '...' if text | length > 120 }}</td><td style='text-align:center'>{{ '%.2f' % sim }}</td></tr>
+      {% endfor %}
+    </tbody></table>
+    {% endif %}
+  </body>
+</html>
+""")
+
 
 def debug_photo_data(photo_data):
     """Debug function to check photo data"""
@@ -35,15 +415,75 @@ def debug_photo_data(photo_data):
         print("Photo data missing comma separator")
         return False
     
-    try:
-        header, data = photo_data.split(',', 1)
-        base64.b64decode(data, validate=True)
-        print(f"Photo data is valid base64, header: {header}")
-        print(f"Photo data length: {len(data)} characters")
-        return True
-    except Exception as e:
-        print(f"Photo data base64 validation failed: {e}")
+    asset = _normalize_photo(photo_data)
+    if asset is None:
+        print("Photo data base64 validation failed")
         return False
+    print(f"Photo data is valid base64, type: {asset.mime}")
+    print(f"Photo data length: {len(asset.raw_bytes)} bytes")
+    return True
+
+
+@dataclass(frozen=True)
+class PhotoAsset:
+    """Profile photo decoded once from its data URL"""
+    raw_bytes: bytes
+    mime: str
+
+
+@lru_cache(maxsize=32)
+def _normalize_photo(photo_data: str) -> Optional[PhotoAsset]:
+    """Decode a data URL photo once and share the result across validation and both renderers"""
+    if not photo_data.startswith('data:image') or ',' not in photo_data:
+        return None
+    header, data = photo_data.split(',', 1)
+    try:
+        raw_bytes = base64.b64decode(data, validate=True)
+    except Exception:
+        return None
+    return PhotoAsset(raw_bytes=raw_bytes, mime=header[len('data:'):].split(';', 1)[0] or "image/jpeg")
+
+
+def _jpeg_size(photo_bytes: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from the JPEG SOF marker without decoding the image"""
+    if photo_bytes[:2] != b'\xff\xd8':
+        return None
+    i = 2
+    while i + 9 <= len(photo_bytes):
+        if photo_bytes[i] != 0xFF:
+            return None
+        marker = photo_bytes[i + 1]
+        if marker in (0xC0, 0xC1, 0xC2):  # baseline, extended, progressive
+            height = int.from_bytes(photo_bytes[i + 5:i + 7], 'big')
+            width = int.from_bytes(photo_bytes[i + 7:i + 9], 'big')
+            return width, height
+        i += 2 + int.from_bytes(photo_bytes[i + 2:i + 4], 'big')
+    return None
+
+
+@lru_cache(maxsize=64)
+def _processed_photo_cached(photo_bytes: bytes, mime: str) -> bytes:
+    """Resize a decoded photo to a 100x100 JPEG once per distinct image"""
+    # Small JPEGs can go to ReportLab as-is, no decode/resample needed
+    if mime == 'image/jpeg':
+        size = _jpeg_size(photo_bytes)
+        if size and size[0] <= 100 and size[1] <= 100:
+            return photo_bytes
+    
+    # Create PIL Image (imported here so text-only exports never load Pillow)
+    from PIL import Image  # type: ignore
+    img = Image.open(io.BytesIO(photo_bytes))
+    
+    # Convert to RGB if necessary
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    # Resize to appropriate size
+    img = img.resize((100, 100), Image.Resampling.BILINEAR)
+    
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='JPEG', quality=85)
+    return img_buffer.getvalue()
 
 
 def process_photo_for_reportlab(photo_data: str):
@@ -53,27 +493,10 @@ def process_photo_for_reportlab(photo_data: str):
             return None
             
         if photo_data.startswith('data:image'):
-            # Extract base64 data
-            if ',' in photo_data:
-                header, data = photo_data.split(',', 1)
-                photo_bytes = base64.b64decode(data)
-                
-                # Create PIL Image
-                img = Image.open(io.BytesIO(photo_bytes))
-                
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize to appropriate size
-                img = img.resize((100, 100), Image.Resampling.LANCZOS)
-                
-                # Save to BytesIO for ReportLab
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format='JPEG', quality=85)
-                img_buffer.seek(0)
-                
-                return img_buffer
+            asset = _normalize_photo(photo_data)
+            if asset:
+                # Fresh stream per call; the processed bytes are shared across renders
+                return io.BytesIO(_processed_photo_cached(asset.raw_bytes, asset.mime))
     except Exception as e:
         print(f"Photo processing error for ReportLab: {e}")
         return None
@@ -249,6 +672,24 @@ def analyze_education_gaps(education: List[Dict[str, Any]], experience: List[Dic
     return gaps
 
 
+def _missing_requirements(job_skills: List[str], all_skills: List[str]) -> List[str]:
+    """Return the job skills that do not appear inside any resume skill"""
+    if ahocorasick is None:
+        return [req for req in job_skills if not any(req in skill for skill in all_skills)]
+    
+    automaton = ahocorasick.Automaton()
+    for req in job_skills:
+        if req:
+            automaton.add_word(req, req)
+    if len(automaton) == 0:
+        return []
+    automaton.make_automaton()
+    
+    # NUL separator keeps a requirement from matching across two skills
+    found = {req for _, req in automaton.iter('\x00'.join(all_skills))}
+    return [req for req in job_skills if req and req not in found]
+
+
 def analyze_skill_gaps(skills: List[str], job_requirements: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Analyze skill gaps based on common industry requirements"""
     gaps = []
@@ -279,10 +720,11 @@ def analyze_skill_gaps(skills: List[str], job_requirements: Optional[List[str]]
         'certifications': ['pmp', 'scrum', 'agile', 'cisco', 'microsoft', 'aws', 'google cloud']
     }
     
-    # Check for missing categories
+    # Check for missing categories; the joined text is built once, not per keyword
+    skills_text = ' '.join(all_skills)
     found_categories = set()
     for category, category_skills in skill_categories.items():
-        if any(cat_skill in ' '.join(all_skills) for cat_skill in category_skills):
+        if any(cat_skill in skills_text for cat_skill in category_skills):
             found_categories.add(category)
     
     missing_categories = set(skill_categories.keys()) - found_categories
@@ -295,12 +737,8 @@ def analyze_skill_gaps(skills: List[str], job_requirements: Optional[List[str]]
     
     # Check against job requirements if provided
     if job_requirements:
-        missing_requirements = []
         job_skills = [req.lower().strip() for req in job_requirements]
-        
-        for req_skill in job_skills:
-            if not any(req_skill in skill for skill in all_skills):
-                missing_requirements.append(req_skill)
+        missing_requirements = _missing_requirements(job_skills, all_skills)
         
         if missing_requirements:
             gaps.append({
@@ -312,6 +750,18 @@ def analyze_skill_gaps(skills: List[str], job_requirements: Optional[List[str]]
     return gaps
 
 
+def _count_gaps(gap_analysis: Dict[str, List[Dict[str, Any]]]) -> Tuple[int, int]:
+    """Count total and high-severity gaps in a single pass"""
+    total_gaps = 0
+    high_severity = 0
+    for gap_list in gap_analysis.values():
+        if not isinstance(gap_list, list):
+            continue
+        total_gaps += len(gap_list)
+        high_severity += sum(1 for gap in gap_list if gap.get('severity') == 'high')
+    return total_gaps, high_severity
+
+
 def comprehensive_gap_analysis(data: Dict[str, Any], job_requirements: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
     """Perform comprehensive gap analysis on resume data"""
     
@@ -329,11 +779,7 @@ def comprehensive_gap_analysis(data: Dict[str, Any], job_requirements: Optional[
     }
     
     # Overall assessment
-    total_gaps = sum(len(gaps) for gaps in gap_analysis.values() if isinstance(gaps, list))
-    high_severity_gaps = sum(1 for gap_list in gap_analysis.values() 
-                           if isinstance(gap_list, list) 
-                           for gap in gap_list 
-                           if gap.get('severity') == 'high')
+    total_gaps, high_severity_gaps = _count_gaps(gap_analysis)
     
     if total_gaps == 0:
         gap_analysis['overall_assessment'].append({
@@ -364,154 +810,79 @@ def generate_pdf_report(
     gap_analysis: Optional[Dict[str, List[Dict[str, Any]]]] = None
 ) -> bytes:
     if _HAS_WEASYPRINT:
-        html_snippets = "".join(
-            f"<tr><td>{text[:120]}{'...' if len(text) > 120 else ''}</td><td style='text-align:center'>{sim:.2f}</td></tr>"
-            for text, sim in (top_snippets or [])[:5]
+        html = _REPORT_TEMPLATE.render(
+            candidate_name=candidate_name or 'Unknown',
+            match_score=match_score,
+            confidence=confidence,
+            generated=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+            explanation=explanation,
+            missing_skills=missing_skills or [],
+            gap_analysis=gap_analysis,
+            top_snippets=(top_snippets or [])[:5],
+        )
+        # With no target WeasyPrint hands back the PDF bytes directly
+        return HTML(string=html).write_pdf(
+            stylesheets=[CSS(string="@page { size: A4; margin: 24pt; }")], **_PDF_OPTIONS
         )
-        html_missing = ", ".join(missing_skills or [])
-        
-        # Generate gap analysis HTML
-        gap_html = ""
-        if gap_analysis:
-            gap_html = "<h2>Gap Analysis</h2>"
-            
-            for gap_type, gaps in gap_analysis.items():
-                if not gaps or gap_type == 'overall_assessment':
-                    continue
-                    
-                section_title = gap_type.replace('_', ' ').title()
-                gap_html += f"<h3>{section_title}</h3>"
-                
-                if gaps:
-                    gap_html += "<ul class='gap-list'>"
-                    for gap in gaps:
-                        severity_class = gap.get('severity', 'medium')
-                        gap_html += f"<li class='gap-{severity_class}'><strong>{gap.get('type', '').replace('_', ' ').title()}:</strong> {gap.get('description', '')}</li>"
-                    gap_html += "</ul>"
-                else:
-                    gap_html += "<p class='no-gaps'>No significant gaps identified in this area.</p>"
-            
-            # Overall assessment
-            if gap_analysis.get('overall_assessment'):
-                gap_html += "<h3>Overall Assessment</h3>"
-                for assessment in gap_analysis['overall_assessment']:
-                    assessment_class = assessment.get('type', 'moderate')
-                    gap_html += f"<p class='assessment-{assessment_class}'>{assessment.get('description', '')}</p>"
-        
-        html = f"""
-        <html>
-          <head>
-            <meta charset='utf-8' />
-            <style>
-              body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 24px; color: #333; line-height: 1.6; }}
-              h1 {{ margin: 0 0 8px; color: #2c3e50; font-size: 24pt; }}
-              h2 {{ margin: 20px 0 12px; color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 4px; font-size: 16pt; }}
-              h3 {{ margin: 16px 0 8px; color: #2c3e50; font-size: 14pt; }}
-              .meta p {{ margin: 2px 0; font-size: 12pt; }}
-              table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-              th, td {{ border: 1px solid #ddd; padding: 12px 8px; }}
-              th {{ background: #f8f9fa; text-align: left; font-weight: 600; }}
-              .score {{ color: #27ae60; font-size: 1.2em; font-weight: bold; }}
-              
-              /* Gap Analysis Styles */
-              .gap-list {{ margin: 10px 0; padding-left: 20px; }}
-              .gap-list li {{ margin: 8px 0; padding: 8px; border-radius: 4px; }}
-              .gap-high {{ background: #fff5f5; border-left: 4px solid #e53e3e; }}
-              .gap-medium {{ background: #fffaf0; border-left: 4px solid #dd6b20; }}
-              .gap-low {{ background: #f7fafc; border-left: 4px solid #4299e1; }}
-              .no-gaps {{ color: #38a169; font-style: italic; }}
-              
-              .assessment-positive {{ color: #38a169; font-weight: bold; padding: 10px; background: #f0fff4; border-radius: 4px; }}
-              .assessment-concern {{ color: #e53e3e; font-weight: bold; padding: 10px; background: #fff5f5; border-radius: 4px; }}
-              .assessment-moderate {{ color: #dd6b20; font-weight: bold; padding: 10px; background: #fffaf0; border-radius: 4px; }}
-              
-              @page {{ size: A4; margin: 24pt; }}
-            </style>
-          </head>
-          <body>
-            <h1>Resume–Job Match Report</h1>
-            <div class='meta'>
-              <p>Candidate: <b>{candidate_name or 'Unknown'}</b></p>
-              <p>Match Score: <b class='score'>{match_score:.1f}%</b></p>
-              <p>Confidence: <b>{confidence:.2f}</b></p>
-              <p>Generated: <b>{datetime.now().strftime('%B %d, %Y at %I:%M %p')}</b></p>
-            </div>
-            
-            <h2>Explanation</h2>
-            <p>{explanation}</p>
-            
-            {f"<h2>Missing/Gap Skills</h2><p>{html_missing}</p>" if html_missing else ''}
-            
-            {gap_html}
-            
-            {"" if not html_snippets else "<h2>Top Matching Resume Snippets</h2>"}
-            {"" if not html_snippets else f"<table><thead><tr><th>Snippet</th><th>Similarity</th></tr></thead><tbody>{html_snippets}</tbody></table>"}
-          </body>
-        </html>
-        """
-        buf = io.BytesIO()
-        HTML(string=html).write_pdf(target=buf, stylesheets=[CSS(string="@page { size: A4; margin: 24pt; }")])
-        return buf.getvalue()
     
     # Fallback: ReportLab
-    from reportlab.lib import colors  # type: ignore
-    from reportlab.lib.pagesizes import A4  # type: ignore
-    from reportlab.lib.styles import getSampleStyleSheet  # type: ignore
-    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle  # type: ignore
+    if not _HAS_REPORTLAB:
+        raise ImportError("PDF export needs WeasyPrint or ReportLab installed")
 
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4)
     styles = getSampleStyleSheet()
+    normal, body, h2, h3 = styles["Normal"], styles["BodyText"], styles["Heading2"], styles["Heading3"]
 
-    elements: List[Any] = []
-    elements.append(Paragraph("Resume–Job Match Report", styles["Title"]))
-    elements.append(Spacer(1, 8))
-    elements.append(Paragraph(f"Candidate: <b>{candidate_name or 'Unknown'}</b>", styles["Normal"]))
-    elements.append(Paragraph(f"Match Score: <b>{match_score:.1f}%</b>", styles["Normal"]))
-    elements.append(Paragraph(f"Confidence: <b>{confidence:.2f}</b>", styles["Normal"]))
-    elements.append(Paragraph(f"Generated: <b>{datetime.now().strftime('%B %d, %Y at %I:%M %p')}</b>", styles["Normal"]))
-    elements.append(Spacer(1, 12))
-    
-    elements.append(Paragraph("Explanation", styles["Heading2"]))
-    elements.append(Paragraph(explanation, styles["BodyText"]))
-    elements.append(Spacer(1, 10))
+    elements: List[Any] = [
+        Paragraph("Resume–Job Match Report", styles["Title"]),
+        Spacer(1, 8),
+        Paragraph(f"Candidate: <b>{candidate_name or 'Unknown'}</b>", normal),
+        Paragraph(f"Match Score: <b>{match_score:.1f}%</b>", normal),
+        Paragraph(f"Confidence: <b>{confidence:.2f}</b>", normal),
+        Paragraph(f"Generated: <b>{datetime.now().strftime('%B %d, %Y at %I:%M %p')}</b>", normal),
+        Spacer(1, 12),
+        Paragraph("Explanation", h2),
+        Paragraph(explanation, body),
+        Spacer(1, 10),
+    ]
     
     if missing_skills:
-        elements.append(Paragraph("Missing/Gap Skills", styles["Heading2"]))
-        elements.append(Paragraph(", ".join(missing_skills), styles["BodyText"]))
-        elements.append(Spacer(1, 10))
+        elements.extend([
+            Paragraph("Missing/Gap Skills", h2),
+            Paragraph(", ".join(missing_skills), body),
+            Spacer(1, 10),
+        ])
     
     # Add gap analysis
     if gap_analysis:
-        elements.append(Paragraph("Gap Analysis", styles["Heading2"]))
+        elements.append(Paragraph("Gap Analysis", h2))
         
         for gap_type, gaps in gap_analysis.items():
             if not gaps or gap_type == 'overall_assessment':
                 continue
                 
             section_title = gap_type.replace('_', ' ').title()
-            elements.append(Paragraph(section_title, styles["Heading3"]))
-            
-            if gaps:
-                for gap in gaps:
-                    elements.append(Paragraph(f"• <b>{gap.get('type', '').replace('_', ' ').title()}:</b> {gap.get('description', '')}", styles["BodyText"]))
-            else:
-                elements.append(Paragraph("No significant gaps identified in this area.", styles["BodyText"]))
-            
+            elements.append(Paragraph(section_title, h3))
+            elements.extend(
+                Paragraph(f"• <b>{gap.get('type', '').replace('_', ' ').title()}:</b> {gap.get('description', '')}", body)
+                for gap in gaps
+            )
             elements.append(Spacer(1, 8))
         
         # Overall assessment
         if gap_analysis.get('overall_assessment'):
-            elements.append(Paragraph("Overall Assessment", styles["Heading3"]))
-            for assessment in gap_analysis['overall_assessment']:
-                elements.append(Paragraph(assessment.get('description', ''), styles["BodyText"]))
+            elements.append(Paragraph("Overall Assessment", h3))
+            elements.extend(
+                Paragraph(assessment.get('description', ''), body)
+                for assessment in gap_analysis['overall_assessment']
+            )
     
     if top_snippets:
         elements.append(Spacer(1, 10))
-        elements.append(Paragraph("Top Matching Resume Snippets", styles["Heading2"]))
+        elements.append(Paragraph("Top Matching Resume Snippets", h2))
         data = [["Snippet", "Similarity"]]
-        for text, sim in top_snippets[:5]:
-            data.append([text[:100] + ("..." if len(text) > 100 else ""), f"{sim:.2f}"])
+        data.extend([text[:100] + ("..." if len(text) > 100 else ""), f"{sim:.2f}"] for text, sim in top_snippets[:5])
         tbl = Table(data, colWidths=[360, 100])
         tbl.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey), ("GRID", (0, 0), (-1, -1), 0.5, colors.grey), ("ALIGN", (1, 1), (-1, -1), "CENTER")]))
         elements.append(tbl)
@@ -520,11 +891,183 @@ def generate_pdf_report(
     return buf.getvalue()
 
 
+# Fixed layout of the ATS resume, compiled once; renders only fill in the blocks
+_ATS_SKELETON = Template(
+    "<html><head><meta charset='utf-8' /></head><body><div class='container'>"
+    "$photo_block$header_block$summary_block$skills_block"
+    "$experience_block$education_block$projects_block$certifications_block"
+    "</div></body></html>"
+)
+
+
+def _block(render: Callable[..., None], *args: Any) -> str:
+    """Run one of the _render_* helpers into its own string for the skeleton"""
+    parts: List[str] = []
+    render(parts, *args)
+    return "".join(parts)
+
+
+def _join_nonempty(parts: List[str], sep: str = " · ") -> str:
+    return sep.join([p for p in parts if p])
+
+
+def _render_list(parts: List[str], items: List[str]) -> None:
+    """Append a bullet list to the ATS resume HTML buffer"""
+    if items:
+        parts.append("<ul class='bullet-list'>")
+        parts.extend(f"<li>{item}</li>" for item in items)
+        parts.append("</ul>")
+
+
+def _render_header(parts: List[str], name: str, contact_line: str) -> None:
+    parts.append(f"<div class='header'><h1>{name or 'Your Name'}</h1>")
+    if contact_line:
+        parts.append(f"<div class='contact-info'>{contact_line}</div>")
+    parts.append("</div>")
+
+
+def _render_section(parts: List[str], title: str, body: str) -> None:
+    parts.append(f"<h2>{title}</h2>")
+    parts.append(body)
+
+
+def _render_items(parts: List[str], title: str, render_item: Callable[[List[str], Dict[str, Any]], None], items: List[Dict[str, Any]]) -> None:
+    if items:
+        parts.append(f"<h2>{title}</h2>")
+        for item in items:
+            render_item(parts, item)
+
+
+def _render_skills(parts: List[str], skills: List[str]) -> None:
+    """Append skills, grouping 'Category: a, b' entries by category"""
+    categorized_skills = {}
+    uncategorized_skills = []
+    
+    for skill in skills:
+        if ':' in skill:
+            category, skill_list = skill.split(':', 1)
+            categorized_skills[category.strip()] = skill_list.strip()
+        else:
+            uncategorized_skills.append(skill)
+    
+    parts.extend(
+        f"<div class='skill-category'><strong>{category}:</strong> {skill_list}</div>"
+        for category, skill_list in categorized_skills.items()
+    )
+    if uncategorized_skills:
+        parts.append(f"<div class='skill-category'>{', '.join(uncategorized_skills)}</div>")
+
+
+def _render_experience_item(parts: List[str], exp: Dict[str, Any]) -> None:
+    title = str(exp.get("title", "")).strip()
+    company = str(exp.get("company", "")).strip()
+    eloc = str(exp.get("location", "")).strip()
+    start = str(exp.get("start", "")).strip()
+    end = str(exp.get("end", "")).strip()
+    
+    parts.append("<div class='experience-item'><div class='item-header'>")
+    parts.append(f"<h3 class='item-title'>{_join_nonempty([title, company], sep=' at ')}</h3>")
+    parts.append(f"<span class='item-date'>{_join_nonempty([start, end], sep=' - ')}</span></div>")
+    if eloc:
+        parts.append(f"<div class='item-location'>{eloc}</div>")
+    _render_list(parts, [str(b).strip() for b in (exp.get("bullets") or []) if str(b).strip()])
+    parts.append("</div>")
+
+
+def _render_education_item(parts: List[str], ed: Dict[str, Any]) -> None:
+    degree = str(ed.get("degree", "")).strip()
+    school = str(ed.get("school", "")).strip()
+    eloc = str(ed.get("location", "")).strip()
+    year = str(ed.get("year", "")).strip()
+    
+    parts.append("<div class='education-item'><div class='item-header'>")
+    parts.append(f"<h3 class='item-title'>{_join_nonempty([degree, school], sep=' - ')}</h3>")
+    parts.append(f"<span class='item-date'>{year}</span></div>")
+    if eloc:
+        parts.append(f"<div class='item-location'>{eloc}</div>")
+    _render_list(parts, [str(b).strip() for b in (ed.get("details") or []) if str(b).strip()])
+    parts.append("</div>")
+
+
+def _render_project_item(parts: List[str], pr: Dict[str, Any]) -> None:
+    pname = str(pr.get("name", "")).strip()
+    pdesc = str(pr.get("description", "")).strip()
+    tech = [str(t).strip() for t in (pr.get("tech") or []) if str(t).strip()]
+    
+    parts.append(f"<div class='project-item'><h3 class='item-title'>{pname}</h3>")
+    parts.append(f"<div class='project-desc'>{pdesc}</div>")
+    if tech:
+        parts.append(f"<div class='tech-stack'><strong>Technologies:</strong> {', '.join(tech)}</div>")
+    parts.append("</div>")
+
+
+def _bullet_list(items: List[str], style) -> Any:
+    """One ReportLab list flowable for a whole group of bullets"""
+    return ListFlowable([ListItem(Paragraph(item, style)) for item in items], bulletType='bullet', leftIndent=12)
+
+
+@lru_cache(maxsize=1)
+def _ats_styles():
+    """Build the ReportLab stylesheet for the ATS resume once and reuse it"""
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    if 'CustomTitle' not in styles:
+        styles.add(ParagraphStyle(
+            name='CustomTitle',
+            parent=styles['Title'],
+            fontSize=24,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            textColor=colors.Color(44/255, 62/255, 80/255)  # #2c3e50
+        ))
+    
+    if 'SectionHeader' not in styles:
+        styles.add(ParagraphStyle(
+            name='SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceBefore=20,
+            spaceAfter=10,
+            textColor=colors.Color(44/255, 62/255, 80/255),
+            borderWidth=1,
+            borderColor=colors.Color(189/255, 195/255, 199/255),
+            borderPadding=5
+        ))
+    return styles
+
+
+# Rendered ATS resumes keyed by a hash of their input, so previews, retries and
+# re-downloads of unchanged data skip the PDF engine entirely
+_ATS_PDF_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+_ATS_PDF_CACHE_SIZE = 32
+# Streamlit sessions run on separate threads; rendering itself happens outside the lock
+_ATS_PDF_CACHE_LOCK = threading.Lock()
+
+
 def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
-    if _HAS_WEASYPRINT:
-        def join_nonempty(parts: List[str], sep: str = " · ") -> str:
-            return sep.join([p for p in parts if p])
+    key = hashlib.blake2b(json.dumps(data, sort_keys=True, default=str).encode("utf-8"), digest_size=16).digest()
+    with _ATS_PDF_CACHE_LOCK:
+        cached = _ATS_PDF_CACHE.get(key)
+        if cached is not None:
+            _ATS_PDF_CACHE.move_to_end(key)
+            return cached
+    
+    pdf = _render_ats_resume_pdf(data)
+    with _ATS_PDF_CACHE_LOCK:
+        _ATS_PDF_CACHE[key] = pdf
+        _ATS_PDF_CACHE.move_to_end(key)
+        while len(_ATS_PDF_CACHE) > _ATS_PDF_CACHE_SIZE:
+            _ATS_PDF_CACHE.popitem(last=False)
+    return pdf
+
 
+def _render_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
+    # Decode the photo once; whichever renderer runs below works from these bytes
+    photo = data.get("photo", None)
+    photo_asset = _normalize_photo(photo) if isinstance(photo, str) else None
+    
+    if _HAS_WEASYPRINT:
         name = str(data.get("name", "")).strip()
         email = str(data.get("email", "")).strip()
         phone = str(data.get("phone", "")).strip()
@@ -532,13 +1075,6 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
         links = [str(x).strip() for x in (data.get("links") or []) if str(x).strip()]
         summary = str(data.get("summary", "")).strip()
         skills = [str(s).strip() for s in (data.get("skills") or []) if str(s).strip()]
-        photo = data.get("photo", None)
-
-        def list_items(items: List[str]) -> str:
-            if not items:
-                return ""
-            li = "".join(f"<li>{item}</li>" for item in items)
-            return f"<ul class='bullet-list'>{li}</ul>"
 
         # Photo HTML - improved validation and processing
         photo_html = ""
@@ -549,12 +1085,9 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
             
             try:
                 if isinstance(photo, str) and photo.startswith('data:image'):
-                    # Validate the base64 data
-                    if ',' in photo:
-                        header, data = photo.split(',', 1)
-                        # Test if it's valid base64
-                        base64.b64decode(data, validate=True)
-                        photo_html = f'<div class="photo-container"><img src="{photo}" class="profile-photo" alt="Profile Photo"></div>'
+                    if photo_asset:
+                        # Hand WeasyPrint the raw bytes instead of inlining the base64 string
+                        photo_html = f'<div class="photo-container"><img src="{_PHOTO_URL}" class="profile-photo" alt="Profile Photo"></div>'
                         print("Photo HTML created successfully")
                     else:
                         photo_html = '<div class="photo-container"><div class="photo-placeholder">Photo</div></div>'
@@ -570,97 +1103,6 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
                 print(f"Photo processing error: {e}")
                 photo_html = '<div class="photo-container"><div class="photo-placeholder">Photo Error</div></div>'
 
-        # Experience section
-        exp_html = ""
-        for exp in (data.get("experience") or []):
-            title = str(exp.get("title", "")).strip()
-            company = str(exp.get("company", "")).strip()
-            eloc = str(exp.get("location", "")).strip()
-            start = str(exp.get("start", "")).strip()
-            end = str(exp.get("end", "")).strip()
-            
-            header_left = join_nonempty([title, company], sep=" at ")
-            header_right = join_nonempty([start, end], sep=" - ")
-            location_line = f"<div class='item-location'>{eloc}</div>" if eloc else ""
-            
-            bullets = [str(b).strip() for b in (exp.get("bullets") or []) if str(b).strip()]
-            exp_html += f"""
-            <div class='experience-item'>
-                <div class='item-header'>
-                    <h3 class='item-title'>{header_left}</h3>
-                    <span class='item-date'>{header_right}</span>
-                </div>
-                {location_line}
-                {list_items(bullets)}
-            </div>
-            """
-
-        # Education section
-        edu_html = ""
-        for ed in (data.get("education") or []):
-            degree = str(ed.get("degree", "")).strip()
-            school = str(ed.get("school", "")).strip()
-            eloc = str(ed.get("location", "")).strip()
-            year = str(ed.get("year", "")).strip()
-            
-            header_left = join_nonempty([degree, school], sep=" - ")
-            location_line = f"<div class='item-location'>{eloc}</div>" if eloc else ""
-            
-            details = [str(b).strip() for b in (ed.get("details") or []) if str(b).strip()]
-            edu_html += f"""
-            <div class='education-item'>
-                <div class='item-header'>
-                    <h3 class='item-title'>{header_left}</h3>
-                    <span class='item-date'>{year}</span>
-                </div>
-                {location_line}
-                {list_items(details) if details else ""}
-            </div>
-            """
-
-        # Projects section
-        proj_html = ""
-        for pr in (data.get("projects") or []):
-            pname = str(pr.get("name", "")).strip()
-            pdesc = str(pr.get("description", "")).strip()
-            tech = [str(t).strip() for t in (pr.get("tech") or []) if str(t).strip()]
-            tech_line = f"<div class='tech-stack'><strong>Technologies:</strong> {', '.join(tech)}</div>" if tech else ""
-            
-            proj_html += f"""
-            <div class='project-item'>
-                <h3 class='item-title'>{pname}</h3>
-                <div class='project-desc'>{pdesc}</div>
-                {tech_line}
-            </div>
-            """
-
-        # Certifications
-        certs = [str(c).strip() for c in (data.get("certifications") or []) if str(c).strip()]
-        cert_html = list_items(certs)
-
-        # Skills formatting - clean categories
-        skills_html = ""
-        if skills:
-            categorized_skills = {}
-            uncategorized_skills = []
-            
-            for skill in skills:
-                if ':' in skill:
-                    category, skill_list = skill.split(':', 1)
-                    categorized_skills[category.strip()] = skill_list.strip()
-                else:
-                    uncategorized_skills.append(skill)
-            
-            if categorized_skills:
-                for category, skill_list in categorized_skills.items():
-                    skills_html += f"<div class='skill-category'><strong>{category}:</strong> {skill_list}</div>"
-            
-            if uncategorized_skills:
-                skills_html += f"<div class='skill-category'>{', '.join(uncategorized_skills)}</div>"
-            
-            if not skills_html:
-                skills_html = f"<div class='skill-category'>{', '.join(skills)}</div>"
-
         # Contact info
         contact_parts = []
         if email:
@@ -677,316 +1119,31 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
         
         contact_line = ' | '.join(contact_parts)
 
-        # Enhanced HTML Template with improved photo support
-        html = f"""
-        <html>
-          <head>
-            <meta charset='utf-8' />
-            <style>
-              * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-              }}
-              
-              body {{ 
-                font-family: 'Arial', sans-serif; 
-                line-height: 1.6;
-                color: #333;
-                font-size: 11pt;
-                background: white;
-              }}
-              
-              .container {{
-                max-width: 8.5in;
-                margin: 0 auto;
-                padding: 0.75in;
-                background: white;
-              }}
-              
-              /* Photo Section - Enhanced */
-              .photo-container {{
-                text-align: center;
-                margin-bottom: 25px;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                width: 100%;
-              }}
-              
-              .profile-photo {{
-                width: 120px !important;
-                height: 120px !important;
-                border-radius: 50%;
-                object-fit: cover;
-                border: 4px solid #2c3e50;
-                box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-                display: block;
-                background: white;
-              }}
-              
-              .photo-placeholder {{
-                width: 120px;
-                height: 120px;
-                border-radius: 50%;
-                background: linear-gradient(135deg, #ecf0f1 0%, #d5dbdb 100%);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: #7f8c8d;
-                font-weight: bold;
-                border: 4px solid #2c3e50;
-                font-size: 14px;
-                box-shadow: 0 6px 12px rgba(0,0,0,0.15);
-              }}
-              
-              /* Header Section */
-              .header {{
-                text-align: center;
-                margin-bottom: 30px;
-                padding-bottom: 20px;
-                border-bottom: 3px solid #2c3e50;
-              }}
-              
-              h1 {{ 
-                font-size: 28pt;
-                font-weight: bold;
-                color: #2c3e50;
-                margin-bottom: 12px;
-                letter-spacing: 1px;
-              }}
-              
-              .contact-info {{
-                font-size: 10pt;
-                color: #555;
-                line-height: 1.5;
-                margin-top: 8px;
-              }}
-              
-              .contact-link {{
-                color: #2980b9;
-                text-decoration: none;
-              }}
-              
-              .contact-link:hover {{
-                text-decoration: underline;
-              }}
-              
-              .contact-item {{
-                color: #555;
-              }}
-              
-              /* Section Headers */
-              h2 {{ 
-                font-size: 14pt;
-                font-weight: bold;
-                color: #2c3e50;
-                margin: 25px 0 15px 0;
-                padding-bottom: 5px;
-                border-bottom: 2px solid #bdc3c7;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-              }}
-              
-              /* Summary Section */
-              .summary {{
-                font-size: 11pt;
-                line-height: 1.7;
-                color: #444;
-                text-align: justify;
-                margin-bottom: 20px;
-                padding: 10px;
-                background: #f8f9fa;
-                border-left: 4px solid #3498db;
-              }}
-              
-              /* Skills Section */
-              .skills-container {{
-                margin-bottom: 20px;
-              }}
-              
-              .skill-category {{
-                margin-bottom: 10px;
-                font-size: 11pt;
-                line-height: 1.6;
-                padding: 5px 0;
-              }}
-              
-              .skill-category strong {{
-                color: #2c3e50;
-                font-weight: bold;
-              }}
-              
-              /* Experience & Education Items */
-              .experience-item, .education-item, .project-item {{
-                margin-bottom: 25px;
-                page-break-inside: avoid;
-                padding: 10px 0;
-                border-bottom: 1px solid #ecf0f1;
-              }}
-              
-              .item-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: baseline;
-                margin-bottom: 6px;
-                flex-wrap: wrap;
-              }}
-              
-              .item-title {{
-                font-size: 12pt;
-                font-weight: bold;
-                color: #2c3e50;
-                margin: 0;
-                flex: 1;
-              }}
-              
-              .item-date {{
-                font-size: 10pt;
-                color: #7f8c8d;
-                font-weight: normal;
-                white-space: nowrap;
-                margin-left: 15px;
-                font-style: italic;
-              }}
-              
-              .item-location {{
-                font-size: 10pt;
-                color: #7f8c8d;
-                font-style: italic;
-                margin-bottom: 10px;
-              }}
-              
-              /* Bullet Lists */
-              .bullet-list {{
-                margin: 12px 0 0 20px;
-                padding: 0;
-              }}
-              
-              .bullet-list li {{
-                margin-bottom: 8px;
-                line-height: 1.6;
-                color: #444;
-                font-size: 11pt;
-              }}
-              
-              /* Projects */
-              .project-desc {{
-                margin: 10px 0;
-                color: #444;
-                line-height: 1.6;
-                font-size: 11pt;
-              }}
-              
-              .tech-stack {{
-                margin-top: 10px;
-                padding: 8px 12px;
-                background: #f8f9fa;
-                border-left: 4px solid #2980b9;
-                font-size: 10pt;
-                color: #555;
-                border-radius: 0 4px 4px 0;
-              }}
-              
-              /* Page breaks */
-              .section {{
-                page-break-inside: avoid;
-              }}
-              
-              /* Print optimizations */
-              @media print {{
-                .container {{
-                  padding: 0.5in;
-                }}
-                
-                .profile-photo, .photo-placeholder {{
-                  width: 100px !important;
-                  height: 100px !important;
-                }}
-                
-                h1 {{
-                  font-size: 24pt;
-                }}
-                
-                .photo-container {{
-                  margin-bottom: 20px;
-                }}
-              }}
-              
-              /* Page layout */
-              @page {{
-                size: A4;
-                margin: 0.6in;
-              }}
-            </style>
-          </head>
-          <body>
-            <div class='container'>
-              {photo_html}
-              
-              <div class='header'>
-                {f"<h1>{name}</h1>" if name else '<h1>Your Name</h1>'}
-                {f"<div class='contact-info'>{contact_line}</div>" if contact_line else ''}
-              </div>
-              
-              {f"<h2>Professional Summary</h2><div class='summary'>{summary}</div>" if summary else ''}
-              
-              {f"<h2>Core Skills</h2><div class='skills-container'>{skills_html}</div>" if skills else ''}
-              
-              {f"<h2>Professional Experience</h2>{exp_html}" if exp_html else ''}
-              
-              {f"<h2>Education</h2>{edu_html}" if edu_html else ''}
-              
-              {f"<h2>Projects</h2>{proj_html}" if proj_html else ''}
-              
-              {f"<h2>Certifications</h2>{cert_html}" if cert_html else ''}
-            </div>
-          </body>
-        </html>
-        """
+        certs = [str(c).strip() for c in (data.get("certifications") or []) if str(c).strip()]
         
-        buf = io.BytesIO()
-        HTML(string=html).write_pdf(
-            target=buf, 
-            stylesheets=[CSS(string="@page { size: A4; margin: 0.6in; }")]
+        # Each block is either empty or a complete section; the skeleton is fixed
+        html = _ATS_SKELETON.substitute(
+            photo_block=photo_html,
+            header_block=_block(_render_header, name, contact_line),
+            summary_block=_block(_render_section, "Professional Summary", f"<div class='summary'>{summary}</div>") if summary else "",
+            skills_block=_block(_render_section, "Core Skills", f"<div class='skills-container'>{_block(_render_skills, skills)}</div>") if skills else "",
+            experience_block=_block(_render_items, "Professional Experience", _render_experience_item, data.get("experience") or []),
+            education_block=_block(_render_items, "Education", _render_education_item, data.get("education") or []),
+            projects_block=_block(_render_items, "Projects", _render_project_item, data.get("projects") or []),
+            certifications_block=_block(_render_section, "Certifications", _block(_render_list, certs)) if certs else "",
+        )
+        
+        return HTML(string=html, url_fetcher=_photo_url_fetcher(photo_asset)).write_pdf(
+            stylesheets=[_ATS_CSS], **_PDF_OPTIONS
         )
-        return buf.getvalue()
     
     # Enhanced ReportLab fallback with photo support
-    from reportlab.lib import colors  # type: ignore
-    from reportlab.lib.pagesizes import A4  # type: ignore
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle  # type: ignore
-    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle  # type: ignore
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT  # type: ignore
-
-    def join_nonempty(parts: List[str], sep: str = " · ") -> str:
-        return sep.join([p for p in parts if p])
+    if not _HAS_REPORTLAB:
+        raise ImportError("PDF export needs WeasyPrint or ReportLab installed")
 
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4, topMargin=0.75*72, bottomMargin=0.75*72)
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    styles.add(ParagraphStyle(
-        name='CustomTitle',
-        parent=styles['Title'],
-        fontSize=24,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        textColor=colors.Color(44/255, 62/255, 80/255)  # #2c3e50
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceBefore=20,
-        spaceAfter=10,
-        textColor=colors.Color(44/255, 62/255, 80/255),
-        borderWidth=1,
-        borderColor=colors.Color(189/255, 195/255, 199/255),
-        borderPadding=5
-    ))
+    styles = _ats_styles()
 
     elements: List[Any] = []
 
@@ -997,19 +1154,17 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
     links = [str(x).strip() for x in (data.get("links") or []) if str(x).strip()]
     
     # Add photo support for ReportLab fallback
-    photo_data = data.get("photo")
-    if photo_data:
+    if photo:
         print("Processing photo for ReportLab fallback...")
-        debug_photo_data(photo_data)
+        debug_photo_data(photo)
         
         try:
-            from reportlab.platypus import Image as ReportLabImage
-            from reportlab.lib.utils import ImageReader
-            
-            processed_photo = process_photo_for_reportlab(photo_data)
+            processed_photo = None
+            if photo_asset:
+                processed_photo = io.BytesIO(_processed_photo_cached(photo_asset.raw_bytes, photo_asset.mime))
             if processed_photo:
                 # Create centered photo
-                photo_img = ReportLabImage(ImageReader(processed_photo), width=100, height=100)
+                photo_img = ReportLabImage(processed_photo, width=100, height=100)
                 
                 # Center the photo using a table
                 photo_table = Table([[photo_img]], colWidths=[100])
@@ -1036,7 +1191,7 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
         elements.append(Paragraph(name, styles["CustomTitle"]))
         elements.append(Spacer(1, 6))
     
-    contact_line = join_nonempty([email, phone, location] + links, " | ")
+    contact_line = _join_nonempty([email, phone, location] + links, " | ")
     if contact_line:
         elements.append(Paragraph(contact_line, styles["Normal"]))
         elements.append(Spacer(1, 12))
@@ -1053,27 +1208,18 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
     if skills:
         elements.append(Paragraph("CORE SKILLS", styles["SectionHeader"]))
         
-        # Handle categorized skills
-        categorized_skills = {}
+        # Handle categorized skills in a single pass
+        category_parts = []
         uncategorized_skills = []
         
         for skill in skills:
             if ':' in skill:
                 category, skill_list = skill.split(':', 1)
-                categorized_skills[category.strip()] = skill_list.strip()
+                category_parts.append(f"<b>{category.strip()}:</b> {skill_list.strip()}<br/>")
             else:
                 uncategorized_skills.append(skill)
         
-        skill_text = ""
-        if categorized_skills:
-            for category, skill_list in categorized_skills.items():
-                skill_text += f"<b>{category}:</b> {skill_list}<br/>"
-        
-        if uncategorized_skills:
-            skill_text += f"{', '.join(uncategorized_skills)}"
-        
-        if not skill_text:
-            skill_text = ", ".join(skills)
+        skill_text = "".join(category_parts) + ", ".join(uncategorized_skills)
         
         elements.append(Paragraph(skill_text, styles["BodyText"]))
         elements.append(Spacer(1, 12))
@@ -1088,8 +1234,8 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
             if not title and not company:
                 continue
                 
-            header = join_nonempty([title, company], " at ")
-            dates = join_nonempty([str(exp.get("start", "")).strip(), str(exp.get("end", "")).strip()], " - ")
+            header = _join_nonempty([title, company], " at ")
+            dates = _join_nonempty([str(exp.get("start", "")).strip(), str(exp.get("end", "")).strip()], " - ")
             
             elements.append(Paragraph(f"<b>{header}</b> | {dates}", styles["Normal"]))
             
@@ -1099,8 +1245,7 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
             
             bullets = [str(b).strip() for b in (exp.get("bullets", []) or []) if str(b).strip()]
             if bullets:
-                for bullet in bullets:
-                    elements.append(Paragraph(f"• {bullet}", styles["BodyText"]))
+                elements.append(_bullet_list(bullets, styles["BodyText"]))
             
             elements.append(Spacer(1, 8))
 
@@ -1114,7 +1259,7 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
             if not degree and not school:
                 continue
                 
-            header = join_nonempty([degree, school], " - ")
+            header = _join_nonempty([degree, school], " - ")
             year = str(ed.get("year", "")).strip()
             
             elements.append(Paragraph(f"<b>{header}</b> | {year}", styles["Normal"]))
@@ -1125,8 +1270,7 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
             
             details = [str(d).strip() for d in (ed.get("details", []) or []) if str(d).strip()]
             if details:
-                for detail in details:
-                    elements.append(Paragraph(f"• {detail}", styles["BodyText"]))
+                elements.append(_bullet_list(details, styles["BodyText"]))
             
             elements.append(Spacer(1, 8))
 
@@ -1155,13 +1299,23 @@ def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
     certs = [str(c).strip() for c in (data.get("certifications", []) or []) if str(c).strip()]
     if certs:
         elements.append(Paragraph("CERTIFICATIONS", styles["SectionHeader"]))
-        for cert in certs:
-            elements.append(Paragraph(f"• {cert}", styles["BodyText"]))
+        elements.append(_bullet_list(certs, styles["BodyText"]))
 
     doc.build(elements)
     return buf.getvalue()
 
 
+def generate_many(resumes: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[bytes]:
+    """Render ATS resume PDFs for several candidates across worker processes"""
+    if len(resumes) < 2:
+        return [generate_ats_resume_pdf(data) for data in resumes]
+    
+    # Fallback workers build the ReportLab stylesheet once at startup, not per resume
+    initializer = _ats_styles if not _HAS_WEASYPRINT and _HAS_REPORTLAB else None
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer) as ex:
+        return list(ex.map(generate_ats_resume_pdf, resumes))
+
+
 # Example usage and utility functions
 def create_sample_resume_data() -> Dict[str, Any]:
     """Create sample resume data for testing"""
@@ -1257,11 +1411,7 @@ def generate_comprehensive_report(
     gap_analysis = comprehensive_gap_analysis(resume_data, job_requirements)
     
     # Generate explanation based on gaps
-    total_gaps = sum(len(gaps) for gaps in gap_analysis.values() if isinstance(gaps, list))
-    high_severity = sum(1 for gap_list in gap_analysis.values() 
-                       if isinstance(gap_list, list) 
-                       for gap in gap_list 
-                       if gap.get('severity') == 'high')
+    total_gaps, high_severity = _count_gaps(gap_analysis)
     
     if total_gaps == 0:
         explanation = "This candidate demonstrates a comprehensive and well-rounded profile with strong alignment across all key areas. No significant gaps were identified in their background."
@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import io
 import base64
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-# Try WeasyPrint first (preferred on systems with GTK/Pango/Cairo)
-try:
-    from weasyprint import HTML, CSS  # type: ignore
-    _HAS_WEASYPRINT = True
-except Exception:
-    HTML = None  # type: ignore
-    CSS = None  # type: ignore
-    _HAS_WEASYPRINT = False
+
+# Try WeasyPrint first (preferred on systems with GTK/Pango/Cairo). It is
+# imported on the first PDF export rather than when the app starts.
+@lru_cache(maxsize=1)
+def _weasyprint() -> Optional[Tuple[Any, Any]]:
+    """WeasyPrint's (HTML, CSS) classes, or None when it is unavailable"""
+    try:
+        from weasyprint import HTML, CSS  # type: ignore
+    except Exception:
+        return None
+    return HTML, CSS
 
 
 def generate_pdf_report(
@@ -22,7 +26,9 @@ def generate_pdf_report(
     missing_skills: List[str],
     top_snippets: List[Tuple[str, float]],
 ) -> bytes:
-    if _HAS_WEASYPRINT:
+    weasyprint = _weasyprint()
+    if weasyprint is not None:
+        HTML, CSS = weasyprint
         html_snippets = "".join(
             f"<tr><td>{text[:120]}{'...' if len(text) > 120 else ''}</td><td style='text-align:center'>{sim:.2f}</td></tr>"
             for text, sim in (top_snippets or [])[:5]
@@ -98,7 +104,9 @@ def generate_pdf_report(
 
 
 def generate_ats_resume_pdf(data: Dict[str, Any]) -> bytes:
-    if _HAS_WEASYPRINT:
+    weasyprint = _weasyprint()
+    if weasyprint is not None:
+        HTML, CSS = weasyprint
         def join_nonempty(parts: List[str], sep: str = " · ") -> str:
             return sep.join([p for p in parts if p])
 
@@ -1,25 +1,50 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Dict
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, FrozenSet, Hashable, List, Optional, Sequence, Tuple, Dict, Union
 
+import numpy as np
 
-def dot(a: List[float], b: List[float]) -> float:
-    return float(sum(x * y for x, y in zip(a, b)))
+Vector = Union[Sequence[float], np.ndarray]
+Skills = Union[Sequence[str], FrozenSet[str]]
 
 
-def norm(a: List[float]) -> float:
-    return float(sum(x * x for x in a) ** 0.5)
+def as_vector(a: Vector) -> np.ndarray:
+    return np.asarray(a, dtype=np.float32)
 
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    denom = (norm(a) * norm(b)) or 1.0
-    return dot(a, b) / denom
+def dot(a: Vector, b: Vector) -> float:
+    return float(np.dot(as_vector(a), as_vector(b)))
 
 
-def compute_match_score(resume_vec: List[float], job_vec: List[float], resume_skills: List[str], job_skills: List[str]) -> Dict[str, object]:
+def norm(a: Vector) -> float:
+    return float(np.linalg.norm(as_vector(a)))
+
+
+def cosine_similarity(a: Vector, b: Vector) -> float:
+    a, b = as_vector(a), as_vector(b)
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b)) or 1.0
+    return float(np.dot(a, b)) / denom
+
+
+@lru_cache(maxsize=256)
+def _lowered_skills(skills: Union[Tuple[str, ...], FrozenSet[str]]) -> FrozenSet[str]:
+    return frozenset(s.lower() for s in skills)
+
+
+def skill_set(skills: Skills) -> FrozenSet[str]:
+    """Lowercased skill set, cached per input so scoring one side against many
+    reuses it. Every input is lowercased, frozensets of raw skills included."""
+    return _lowered_skills(skills if isinstance(skills, frozenset) else tuple(skills))
+
+
+def compute_match_score(resume_vec: Vector, job_vec: Vector, resume_skills: Skills, job_skills: Skills) -> Dict[str, object]:
     sim = cosine_similarity(resume_vec, job_vec)
-    rs = set(s.lower() for s in resume_skills)
-    js = set(s.lower() for s in job_skills)
+    rs = skill_set(resume_skills)
+    js = skill_set(job_skills)
     skill_overlap = len(rs & js)
     skill_union = len(rs | js) or 1
     jaccard = skill_overlap / skill_union
@@ -28,7 +53,7 @@ def compute_match_score(resume_vec: List[float], job_vec: List[float], resume_sk
     score_pct = max(0.0, min(1.0, score)) * 100.0
     confidence = 0.5 + 0.5 * min(sim, 1.0)
 
-    missing_skills = sorted(list(js - rs))
+    missing_skills = sorted(js - rs)
 
     explanation = (
         f"Semantic similarity: {sim:.2f}. Skill overlap: {skill_overlap}/{skill_union}. Combined score: {score_pct:.1f}%."
@@ -43,7 +68,123 @@ def compute_match_score(resume_vec: List[float], job_vec: List[float], resume_sk
     }
 
 
-def top_k_matches(query_vec: List[float], corpus_texts: List[str], corpus_vecs: List[List[float]], k: int = 5) -> List[Tuple[str, float]]:
-    sims = [(text, cosine_similarity(query_vec, vec)) for text, vec in zip(corpus_texts, corpus_vecs)]
-    sims.sort(key=lambda x: x[1], reverse=True)
-    return sims[:k]
+def top_k_matches(
+    query_vec: Vector,
+    corpus_texts: List[str],
+    corpus_vecs: Union[Sequence[Vector], np.ndarray],
+    k: int = 5,
+    corpus_norms: Optional[np.ndarray] = None,
+) -> List[Tuple[str, float]]:
+    k = min(k, len(corpus_texts))
+    if k <= 0:
+        return []
+    query = as_vector(query_vec)
+    matrix = as_vector(corpus_vecs)
+    if corpus_norms is None:
+        corpus_norms = np.linalg.norm(matrix, axis=1)
+    # One matrix-vector product instead of a cosine call per snippet
+    denoms = corpus_norms * np.linalg.norm(query)
+    denoms[denoms == 0] = 1.0
+    scores = (matrix @ query) / denoms
+    # Partial selection of the k best, then order just those k
+    idx = np.argpartition(scores, -k)[-k:]
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [(corpus_texts[i], float(scores[i])) for i in idx]
+
+
+@dataclass
+class QuantizedCorpus:
+    """Snippet embeddings stored as symmetric per-row int8 codes (vec ~= codes * scale)."""
+
+    texts: List[str]
+    codes: np.ndarray  # (N, D) int8
+    scales: np.ndarray  # (N,) float32
+    norms: np.ndarray  # (N,) float32, norms of the original float vectors
+
+
+def quantize_int8(vecs: Union[Sequence[Vector], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    matrix = np.atleast_2d(as_vector(vecs))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_corpus(corpus_texts: List[str], corpus_vecs: Union[Sequence[Vector], np.ndarray]) -> QuantizedCorpus:
+    matrix = np.atleast_2d(as_vector(corpus_vecs))
+    codes, scales = quantize_int8(matrix)
+    return QuantizedCorpus(texts=list(corpus_texts), codes=codes, scales=scales, norms=np.linalg.norm(matrix, axis=1))
+
+
+def top_k_matches_quantized(query_vec: Vector, corpus: QuantizedCorpus, k: int = 5) -> List[Tuple[str, float]]:
+    k = min(k, len(corpus.texts))
+    if k <= 0:
+        return []
+    query = as_vector(query_vec)
+    q_codes, q_scale = quantize_int8(query)
+    # int8 x int8 products accumulated in int32, then rescaled to float
+    dots = np.matmul(corpus.codes, q_codes[0], dtype=np.int32) * (corpus.scales * q_scale[0])
+    denoms = corpus.norms * np.linalg.norm(query)
+    denoms[denoms == 0] = 1.0
+    scores = dots / denoms
+    idx = np.argpartition(scores, -k)[-k:]
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [(corpus.texts[i], float(scores[i])) for i in idx]
+
+
+class SemanticCache:
+    """Reuse a stored value when a new query vector is a near-duplicate of an earlier one.
+
+    Entries live in buckets (e.g. one per resume and job skill set), and a lookup
+    only matches within its bucket when cosine similarity >= threshold. Stored
+    vectors are unit-normalised int8 codes with a scale per row, 4x smaller than
+    float32. Each bucket keeps its newest max_per_bucket entries, and only the
+    max_buckets most recently used buckets are kept, so a long-lived instance
+    stays bounded however many resumes it sees.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_per_bucket: int = 256, max_buckets: int = 256) -> None:
+        self.threshold = float(threshold)
+        self.max_per_bucket = int(max_per_bucket)
+        self.max_buckets = int(max_buckets)
+        self._buckets: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vec: Vector) -> Optional[np.ndarray]:
+        v = as_vector(vec)
+        n = float(np.linalg.norm(v))
+        return v / n if n > 0 else None
+
+    def lookup(self, bucket: Hashable, vec: Vector) -> Optional[Any]:
+        q = self._unit(vec)
+        with self._lock:
+            entry = self._buckets.get(bucket)
+            if entry is not None:
+                self._buckets.move_to_end(bucket)
+        if q is None or entry is None:
+            return None
+        codes, scales, values = entry
+        q_codes, q_scale = quantize_int8(q)
+        # int8 x int8 products accumulated in int32; both sides are unit vectors
+        sims = np.matmul(codes, q_codes[0], dtype=np.int32) * (scales * q_scale[0])
+        i = int(np.argmax(sims))
+        return values[i] if sims[i] >= self.threshold else None
+
+    def add(self, bucket: Hashable, vec: Vector, value: Any) -> None:
+        q = self._unit(vec)
+        if q is None:
+            return
+        q_codes, q_scale = quantize_int8(q)
+        with self._lock:
+            codes, scales, values = self._buckets.get(
+                bucket, (np.empty((0, len(q)), dtype=np.int8), np.empty(0, dtype=np.float32), [])
+            )
+            self._buckets[bucket] = (
+                np.vstack([codes, q_codes])[-self.max_per_bucket:],
+                np.concatenate([scales, q_scale])[-self.max_per_bucket:],
+                (values + [value])[-self.max_per_bucket:],
+            )
+            self._buckets.move_to_end(bucket)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
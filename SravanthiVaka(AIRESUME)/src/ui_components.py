@@ -11,11 +11,15 @@ def show_workflow_diagram(fig: go.Figure) -> None:
     st.plotly_chart(fig, use_container_width=True)
 
 
+def show_agent_output(name: str, data: dict) -> None:
+    st.markdown(f"**{name}**")
+    st.json(data)
+
+
 def show_agent_outputs(outputs: List[Tuple[str, dict]]) -> None:
     with st.expander("Agent Outputs", expanded=False):
         for name, data in outputs:
-            st.markdown(f"**{name}**")
-            st.json(data)
+            show_agent_output(name, data)
 
 
 def show_match_summary(score: float, confidence: float, missing_skills: List[str], explanation: str, top_snippets: List[Tuple[str, float]]) -> None:
@@ -32,5 +36,5 @@ def show_match_summary(score: float, confidence: float, missing_skills: List[str
 
     if top_snippets:
         st.markdown("**Top Matching Snippets**")
-        for text, sim in top_snippets[:5]:
-            st.write(f"{sim:.2f} — {text}")
+        # matcher_and_scoring_agent already caps the list at k=5
+        st.markdown("\n".join(f"- **{sim:.2f}** — {text}" for text, sim in top_snippets))
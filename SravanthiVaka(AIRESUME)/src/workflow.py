@@ -1,13 +1,41 @@
 from __future__ import annotations
 
+import hashlib
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-import networkx as nx
-import plotly.graph_objects as go
+import numpy as np
 
 from .agents import AgentResult
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# networkx, plotly and scipy are imported on first use only, so importing this
+# module (e.g. just for build_workflow_trace) stays cheap
+
+
+@lru_cache(maxsize=None)
+def _get_go():
+    import plotly.graph_objects as go
+
+    return go
+
+
+@lru_cache(maxsize=None)
+def _get_scipy():
+    """(minimize, pdist, squareform) from SciPy, or None when it is not installed"""
+    try:
+        from scipy.optimize import minimize  # type: ignore
+        from scipy.spatial.distance import pdist, squareform  # type: ignore
+    except Exception:
+        return None
+    return minimize, pdist, squareform
+
 
 @dataclass
 class WorkflowTrace:
@@ -21,75 +49,176 @@ def build_workflow_trace(steps: List[AgentResult]) -> WorkflowTrace:
     return WorkflowTrace(steps=steps, edges=edges)
 
 
-def workflow_figure(trace: WorkflowTrace) -> go.Figure:
+def _spring_layout_lbfgs(names: List[str], edges: List[Tuple[str, str]], maxiter: int = 50) -> Dict[str, np.ndarray]:
+    """Fruchterman-Reingold style layout solved as one energy minimisation with L-BFGS.
+
+    Attraction is sum ||p_i - p_j||^2 / k over edges, repulsion is -k^2 * sum log ||p_i - p_j||
+    over all pairs; both come with analytic gradients so the solver needs few iterations.
+    Falls back to nx.spring_layout when SciPy is not installed.
+    """
+    import networkx as nx
+
     g = nx.DiGraph()
+    g.add_nodes_from(names)
+    g.add_edges_from(edges)
+    nodes = list(g)
+    n = len(nodes)
+    scipy_funcs = _get_scipy()
+    if scipy_funcs is None or n < 3:
+        return nx.spring_layout(g, seed=42)
+    minimize, pdist, squareform = scipy_funcs
+
+    adj = nx.to_scipy_sparse_array(g, nodelist=nodes, weight=None, format="csr")
+    w = adj + adj.T
+    laplacian = np.diag(np.asarray(w.sum(axis=1)).ravel()) - w.toarray()
+    k = 1.0 / np.sqrt(n)
+
+    def energy(x: np.ndarray) -> Tuple[float, np.ndarray]:
+        p = x.reshape(n, 2)
+        lp = laplacian @ p
+        dist = np.maximum(pdist(p), 1e-9)
+        inv_sq = squareform(1.0 / dist**2)
+        f = float(np.sum(p * lp)) / k - k**2 * float(np.sum(np.log(dist)))
+        grad = 2.0 * lp / k - k**2 * (inv_sq.sum(axis=1)[:, None] * p - inv_sq @ p)
+        return f, grad.ravel()
+
+    x0 = np.random.default_rng(42).standard_normal((n, 2)).ravel()
+    res = minimize(energy, x0, jac=True, method="L-BFGS-B", options={"maxiter": maxiter})
+    xy = nx.rescale_layout(res.x.reshape(n, 2))
+    return dict(zip(nodes, xy))
+
+
+# Hover summaries show at most this many items, each value cut to this length
+_SUMMARY_MAX_ITEMS = 6
+_SUMMARY_MAX_LEN = 40
+_NL_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+_FALLBACK_RE = re.compile("fallback", re.IGNORECASE)
+_FALLBACK_SCAN_LEN = 256
+_PALETTE = ("#1f77b4", "#ff7f0e")  # blue, orange (fallback)
+_SCATTERGL_MIN_STEPS = 30
+# Bound format_map of the node hover template: one C-level format call per node
+_HOVER_TMPL = "<b>{n}</b><br>Inputs: {i}<br>Outputs: {o}<br>Reasoning: {r}".format_map
+
+
+def _trunc(s: str, max_len: int = _SUMMARY_MAX_LEN) -> str:
+    return f"{s[:max_len]}…" if len(s) > max_len else s
+
+
+def _count(v: Any) -> str:
+    return f"[{len(v)}]"
+
+
+def _text(v: Any) -> str:
+    return _trunc(str(v).translate(_NL_TABLE))
+
+
+# Exact-type dispatch for the common value types; subclasses take the isinstance path
+_HANDLERS = {list: _count, tuple: _count, int: str, float: str, str: _text}
+
+
+def _summarize(d: Dict[str, Any]) -> str:
+    items: List[str] = []
+    for k, v in islice(d.items(), _SUMMARY_MAX_ITEMS):
+        handler = _HANDLERS.get(type(v))
+        if handler is None:
+            if isinstance(v, (list, tuple)):
+                handler = _count
+            elif isinstance(v, (int, float)):
+                handler = str
+            else:
+                handler = _text
+        items.append(f"{k}={handler(v)}")
+    return ", ".join(items)
+
+
+_LAYOUT_CACHE_DIR = Path("~/.cache/airesume/layout").expanduser()
+
+
+def _cached_spring_layout(names: Sequence[str], edges: Sequence[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """Spring layout persisted on disk per graph, so a repeated topology skips the solve"""
+    solver = "lbfgs" if _get_scipy() is not None else "nx"
+    key = hashlib.blake2b(repr((solver, list(names), sorted(edges))).encode("utf-8"), digest_size=16).hexdigest()
+    path = _LAYOUT_CACHE_DIR / f"{key}.npz"
+    try:
+        with np.load(path) as cached:
+            return dict(zip(cached["names"].tolist(), cached["xy"]))
+    except Exception:
+        pass
+
+    pos = _spring_layout_lbfgs(list(names), list(edges))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, names=np.array(list(pos), dtype=str), xy=np.array(list(pos.values()), dtype=np.float64))
+    except OSError:
+        pass
+    return pos
+
+
+def _chain_layout(names: Sequence[str], edges: Sequence[Tuple[str, str]]) -> Optional[Dict[str, Tuple[float, float]]]:
+    """Closed-form left-to-right layout when the trace is a simple chain, else None"""
+    if len(set(names)) != len(names) or list(edges) != list(zip(names, names[1:])):
+        return None
+    n = len(names)
+    return {name: (i / (n - 1) if n > 1 else 0.5, 0.0) for i, name in enumerate(names)}
+
+
+def workflow_figure(trace: WorkflowTrace) -> go.Figure:
+    """Figure for a workflow trace. Identical traces share one cached figure, so treat it as read-only."""
+    # Prepare rich node hover info and conditional coloring; together with the
+    # names and edges this is everything the figure shows, so it doubles as the cache key
+    hover_texts: List[str] = []
+    is_fallback: List[bool] = []
     for s in trace.steps:
-        g.add_node(s.name)
-    for u, v in trace.edges:
-        g.add_edge(u, v)
-
-    pos = nx.spring_layout(g, seed=42)
-
-    edge_x, edge_y = [], []
-    for u, v in g.edges():
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-
-    # Prepare rich node hover info and conditional coloring
-    node_x, node_y, text, hover_texts, colors = [], [], [], [], []
-    name_to_step: Dict[str, AgentResult] = {s.name: s for s in trace.steps}
-    for n in g.nodes():
-        x, y = pos[n]
-        node_x.append(x)
-        node_y.append(y)
-        text.append(n)
-        step = name_to_step.get(n)
-        inputs = step.inputs if step else {}
-        outputs = step.outputs if step else {}
-        reasoning = step.reasoning if step else ""
-
-        def _summarize(d: Dict[str, Any]) -> str:
-            items: List[str] = []
-            for k, v in list(d.items())[:6]:
-                if isinstance(v, (list, tuple)):
-                    items.append(f"{k}=[{len(v)}]")
-                elif isinstance(v, (int, float)):
-                    items.append(f"{k}={v}")
-                else:
-                    s = str(v)
-                    s = s.replace("\n", " ")
-                    items.append(f"{k}={s[:40]}{'…' if len(s)>40 else ''}")
-            return ", ".join(items)
-
-        hover_text = (
-            f"<b>{n}</b><br>"
-            f"Inputs: {_summarize(inputs) or '—'}<br>"
-            f"Outputs: {_summarize(outputs) or '—'}<br>"
-            f"Reasoning: {reasoning[:120]}{'…' if len(reasoning)>120 else ''}"
+        reasoning = s.reasoning or ""
+        hover_texts.append(
+            _HOVER_TMPL({"n": s.name, "i": _summarize(s.inputs) or "—", "o": _summarize(s.outputs) or "—", "r": _trunc(reasoning, 120)})
         )
-        hover_texts.append(hover_text)
-
-        # Color code: fallback/orange if reasoning mentions fallback, else blue
-        if reasoning and "fallback" in reasoning.lower():
-            colors.append("#ff7f0e")  # orange
-        else:
-            colors.append("#1f77b4")  # blue
-
-    edge_trace = go.Scatter(x=edge_x, y=edge_y, line=dict(width=1, color="#888"), hoverinfo="none", mode="lines")
-    node_trace = go.Scatter(
-        x=node_x,
-        y=node_y,
-        mode="markers+text",
-        text=text,
-        textposition="bottom center",
-        hoverinfo="text",
-        hovertext=hover_texts,
-        hovertemplate="%{hovertext}<extra></extra>",
-        marker=dict(showscale=False, color=colors, size=18, line=dict(width=2, color="#fff")),
+        # Color code: fallback/orange if reasoning mentions fallback, else blue.
+        # Agents say so up front, so only the head of long reasoning is scanned
+        is_fallback.append(_FALLBACK_RE.search(reasoning, 0, _FALLBACK_SCAN_LEN) is not None)
+    return _workflow_figure_cached(
+        tuple(s.name for s in trace.steps), tuple(trace.edges), tuple(hover_texts), tuple(is_fallback)
     )
 
-    fig = go.Figure(data=[edge_trace, node_trace])
-    fig.update_layout(margin=dict(l=20, r=20, t=20, b=20), showlegend=False, hovermode="closest")
-    return fig
+
+@lru_cache(maxsize=32)
+def _workflow_figure_cached(
+    names: Tuple[str, ...],
+    edges: Tuple[Tuple[str, str], ...],
+    hover_texts: Tuple[str, ...],
+    is_fallback: Tuple[bool, ...],
+) -> go.Figure:
+    # build_workflow_trace produces a chain, whose force layout is just a line anyway
+    pos = _chain_layout(names, edges) or _cached_spring_layout(names, edges)
+
+    # Edge segments as one (3 * edges, 2) array: start, end, NaN break per edge
+    name_to_idx = {name: i for i, name in enumerate(names)}
+    pos_arr = np.array([pos[name] for name in names], dtype=np.float64).reshape(-1, 2)
+    edge_xy = np.full((len(edges) * 3, 2), np.nan)
+    if edges:
+        ei = np.fromiter((name_to_idx[u] for u, _ in edges), dtype=np.intp, count=len(edges))
+        ej = np.fromiter((name_to_idx[v] for _, v in edges), dtype=np.intp, count=len(edges))
+        edge_xy[0::3] = pos_arr[ei]
+        edge_xy[1::3] = pos_arr[ej]
+    colors = [_PALETTE[fb] for fb in is_fallback]
+
+    # Plain dict traces: everything here is generated internally, so skip Plotly's
+    # per-property validation and copying in the go.Scatter constructors
+    # WebGL rendering keeps large workflows interactive; SVG is fine (and crisper) for small ones.
+    # Only the edge lines switch: WebGL text support is partial, so the labelled nodes stay SVG.
+    edge_type = "scattergl" if len(names) > _SCATTERGL_MIN_STEPS else "scatter"
+    edge_trace = {"type": edge_type, "x": edge_xy[:, 0], "y": edge_xy[:, 1], "line": {"width": 1, "color": "#888"}, "hoverinfo": "none", "mode": "lines"}
+    node_trace = {
+        "type": "scatter",
+        "x": pos_arr[:, 0],
+        "y": pos_arr[:, 1],
+        "mode": "markers+text",
+        "text": list(names),
+        "textposition": "bottom center",
+        "hoverinfo": "text",
+        "hovertext": list(hover_texts),
+        "marker": {"showscale": False, "color": colors, "size": 18, "line": {"width": 2, "color": "#fff"}},
+    }
+
+    layout = {"margin": {"l": 20, "r": 20, "t": 20, "b": 20}, "showlegend": False, "hovermode": "closest"}
+    return _get_go().Figure(data=[edge_trace, node_trace], layout=layout, _validate=False)
@@ -0,0 +1,14 @@
+import numpy as np
+
+from src.scoring import compute_match_score, skill_set
+
+
+def test_skill_set_lowercases_frozenset_input():
+    assert skill_set(frozenset({"Python", "SQL"})) == frozenset({"python", "sql"})
+
+
+def test_mixed_case_frozenset_matches_list_skills():
+    v = np.ones(4)
+    result = compute_match_score(v, v, ["Python"], frozenset({"Python"}))
+    assert result["jaccard"] == 1.0
+    assert result["missing_skills"] == []
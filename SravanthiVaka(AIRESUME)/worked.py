@@ -2,17 +2,39 @@ from __future__ import annotations
 
 import io
 import os
+import re
 import base64
-from typing import List, Dict, Any
+import asyncio
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from PIL import Image
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-from src.embeddings import EmbeddingService
-from src.agents import content_enhancer_agent, job_parser_agent, matcher_and_scoring_agent, resume_parser_agent
-from src.reporting import generate_pdf_report, generate_ats_resume_pdf
-from src.workflow import build_workflow_trace, workflow_figure
-from src.ui_components import show_agent_outputs, show_match_summary, show_workflow_diagram
+# The agents, embeddings, reporting and workflow modules pull in LangChain,
+# ChromaDB, Plotly and the PDF backends, so they are imported in the pages
+# that use them to keep the Welcome page cold start fast.
+if TYPE_CHECKING:
+    from src.embeddings import EmbeddingService
+
+# Optional SIMD base64 encoder for photo data URLs
+try:
+    from pybase64 import b64encode_as_string as _b64encode  # type: ignore
+except Exception:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+# Newline plus any surrounding horizontal whitespace
+_LINE_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+
+
+def _split_bullets(text: str) -> List[str]:
+    """Split a text area into stripped, non-empty lines"""
+    if not text:
+        return []
+    return [s for s in _LINE_RE.split(text.strip()) if s]
 
 
 # Enhanced page config with custom styling
@@ -23,185 +45,29 @@ st.set_page_config(
     page_icon="🚀"
 )
 
-# Custom CSS for modern styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    .stApp {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Header Styling */
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-    }
-    
-    .main-header h1 {
-        font-size: 3rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    .main-header p {
-        font-size: 1.2rem;
-        opacity: 0.9;
-        margin-bottom: 0;
-    }
-    
-    /* Feature Cards */
-    .feature-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 5px 20px rgba(0,0,0,0.08);
-        border-left: 5px solid;
-        margin-bottom: 1.5rem;
-        transition: transform 0.3s ease;
-    }
-    
-    .feature-card:hover {
-        transform: translateY(-5px);
-    }
-    
-    .feature-card.matching {
-        border-left-color: #4CAF50;
-        background: linear-gradient(135deg, #f8fff8 0%, #e8f8e8 100%);
-    }
-    
-    .feature-card.builder {
-        border-left-color: #2196F3;
-        background: linear-gradient(135deg, #f0f8ff 0%, #e0f0ff 100%);
-    }
-    
-    .feature-card.analytics {
-        border-left-color: #FF9800;
-        background: linear-gradient(135deg, #fff8f0 0%, #ffe8d0 100%);
-    }
-    
-    /* Stats Cards */
-    .stats-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .stats-card h3 {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
-    
-    .stats-card p {
-        font-size: 0.9rem;
-        opacity: 0.9;
-    }
-    
-    /* Resume Preview */
-    .resume-preview {
-        background: white;
-        border: 2px dashed #e0e0e0;
-        border-radius: 15px;
-        padding: 2rem;
-        text-align: center;
-        margin: 1rem 0;
-    }
-    
-    .resume-preview img {
-        max-width: 100%;
-        height: auto;
-        border-radius: 10px;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-    }
-    
-    /* Colorful Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 25px;
-        padding: 0.5rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Sidebar Styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #f8f9ff 0%, #f0f4ff 100%);
-    }
-    
-    /* Progress Bars */
-    .progress-bar {
-        background: linear-gradient(90deg, #4CAF50 0%, #45a049 100%);
-        height: 8px;
-        border-radius: 4px;
-        margin: 0.5rem 0;
-    }
-    
-    /* Form Styling */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea {
-        border-radius: 10px;
-        border: 2px solid #e0e0e0;
-        transition: border-color 0.3s ease;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        border-color: #667eea;
-        box-shadow: 0 0 0 2px rgba(102, 126, 234, 0.2);
-    }
-    
-    /* Expander Styling */
-    .streamlit-expanderHeader {
-        background: linear-gradient(135deg, #f8f9ff 0%, #f0f4ff 100%);
-        border-radius: 10px;
-        font-weight: 600;
-    }
-    
-    /* Alert Styling */
-    .stAlert {
-        border-radius: 10px;
-    }
-    
-    /* Success Message */
-    .success-message {
-        background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-        color: #155724;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 5px solid #28a745;
-        margin: 1rem 0;
-    }
-    
-    /* Info Message */
-    .info-message {
-        background: linear-gradient(135deg, #cce7ff 0%, #b3d9ff 100%);
-        color: #004085;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 5px solid #007bff;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+
+_CSS_PATH = Path(__file__).parent / "static" / "app.css"
+_FONT_LINKS = """
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap">
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _css_blob() -> str:
+    """Custom CSS for modern styling, minified once from static/app.css"""
+    css = _CSS_PATH.read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"\s+", " ", css).replace(";}", "}").strip()
+    return f"{_FONT_LINKS}<style>{css}</style>"
+
+
+def inject_css() -> None:
+    # Streamlit drops elements that a rerun does not emit again, so this has
+    # to run on every rerun; only the string itself is cached.
+    st.markdown(_css_blob(), unsafe_allow_html=True)
 
 try:
     import importlib
@@ -211,291 +77,433 @@ except Exception:
     pass
 
 
+@st.cache_resource(show_spinner="Loading embedding model...")
+def get_embedding_service() -> EmbeddingService:
+    """Shared embedding service, constructed once per process (treat as read-only)"""
+    from src.embeddings import EmbeddingService
+    service = EmbeddingService()
+    service.warmup()
+    return service
+
+
+# Parses survive restarts on disk. Streamlit ignores ttl for disk-persisted
+# caches, so these are bounded by max_entries only. They run on worker threads,
+# and only read or write the cache through _call_with_ctx.
+@st.cache_data(persist="disk", max_entries=512, show_spinner=False)
+def cached_resume_parse(resume_bytes: bytes):
+    from src.agents import resume_parser_agent
+    return resume_parser_agent(resume_bytes)
+
+
+@st.cache_data(persist="disk", max_entries=512, show_spinner=False)
+def cached_job_parse(job_desc: str):
+    from src.agents import job_parser_agent
+    return job_parser_agent(job_desc)
+
+
+@st.cache_data(ttl="1h", max_entries=128, show_spinner=False)
+def cached_enhance(raw_text: str):
+    from src.agents import content_enhancer_agent
+    return content_enhancer_agent(raw_text)
+
+
+def _call_with_ctx(ctx, fn, *args):
+    """Call fn on a worker thread with the script's ScriptRunContext attached.
+
+    st.cache_data neither reads nor writes on a thread without one, so the
+    cached parsers would otherwise rerun on every analysis.
+    """
+    add_script_run_ctx(threading.current_thread(), ctx)
+    return fn(*args)
+
+
+async def _run_parsing_agents(resume_bytes: bytes, job_desc: str, on_step):
+    """Run the resume and job parsers concurrently, then the enhancer on the resume text"""
+    ctx = get_script_run_ctx()
+
+    async def resume_then_enhance():
+        a1 = await asyncio.to_thread(_call_with_ctx, ctx, cached_resume_parse, resume_bytes)
+        on_step("resume")
+        a3 = await asyncio.to_thread(_call_with_ctx, ctx, cached_enhance, a1.outputs["raw_text"])
+        on_step("enhance")
+        return a1, a3
+
+    async def parse_job():
+        a2 = await asyncio.to_thread(_call_with_ctx, ctx, cached_job_parse, job_desc)
+        on_step("job")
+        return a2
+
+    (a1, a3), a2 = await asyncio.gather(resume_then_enhance(), parse_job())
+    return a1, a2, a3
+
+
 def process_uploaded_image(uploaded_file) -> str:
     """Convert uploaded image to base64 data URL"""
     if uploaded_file is not None:
         try:
             image = Image.open(uploaded_file)
+            if image.format == 'JPEG':
+                # Let libjpeg downscale in the DCT domain before decoding
+                image.draft('RGB', (600, 600))
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             image.thumbnail((300, 300), Image.Resampling.LANCZOS)
             buffer = io.BytesIO()
-            image.save(buffer, format='JPEG', quality=85)
-            img_data = buffer.getvalue()
-            b64_string = base64.b64encode(img_data).decode()
-            return f"data:image/jpeg;base64,{b64_string}"
+            image.save(buffer, format='JPEG', quality=82, optimize=True, progressive=True)
+            return f"data:image/jpeg;base64,{_b64encode(buffer.getvalue())}"
         except Exception as e:
             st.error(f"Error processing image: {e}")
             return ""
     return ""
 
 
+# (name, background gradient, header gradient, line colour, bar opacity, line widths)
+TEMPLATE_CARDS = (
+    ("John Doe", ("#f8f9fa", "#e9ecef"), ("#667eea", "#764ba2"), "#e9ecef", 0.7, (80, 60, 90, 70, 85)),
+    ("Jane Smith", ("#fff8f0", "#ffe8d0"), ("#FF9800", "#F57C00"), "#FFE0B2", 0.8, (75, 90, 95, 80, 88)),
+    ("Alex Johnson", ("#f0f8ff", "#e0f0ff"), ("#2196F3", "#1976D2"), "#BBDEFB", 0.8, (85, 70, 92, 75, 87)),
+)
+
+_CARD_TMPL = """
+<div style="background: linear-gradient(135deg, {bg1} 0%, {bg2} 100%); width: 100%; height: 280px; border-radius: 10px; box-shadow: 0 5px 15px rgba(0,0,0,0.1); display: flex; flex-direction: column; padding: 1rem; margin-bottom: 1rem;">
+<div style="background: linear-gradient(135deg, {c1} 0%, {c2} 100%); height: 40px; border-radius: 5px; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; color: white; font-weight: bold;">{name}</div>
+<div style="background: {line}; height: 8px; border-radius: 4px; margin-bottom: 0.5rem;"></div>
+<div style="background: {line}; height: 8px; border-radius: 4px; margin-bottom: 0.5rem; width: {w[0]}%;"></div>
+<div style="background: {line}; height: 8px; border-radius: 4px; margin-bottom: 1rem; width: {w[1]}%;"></div>
+<div style="background: {c1}; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: {opacity};"></div>
+<div style="background: {line}; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
+<div style="background: {line}; height: 6px; border-radius: 3px; margin-bottom: 0.3rem; width: {w[2]}%;"></div>
+<div style="background: {line}; height: 6px; border-radius: 3px; margin-bottom: 1rem; width: {w[3]}%;"></div>
+<div style="background: {c2}; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: {opacity};"></div>
+<div style="background: {line}; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
+<div style="background: {line}; height: 6px; border-radius: 3px; width: {w[4]}%;"></div>
+</div>
+"""
+
+# (value, label, background override)
+STATS_CARDS = (
+    ("95%", "Matching Accuracy", ""),
+    ("10K+", "Resumes Processed", "linear-gradient(135deg, #4CAF50 0%, #45a049 100%)"),
+    ("24/7", "AI Availability", "linear-gradient(135deg, #FF9800 0%, #F57C00 100%)"),
+)
+
+_STATS_TMPL = """
+<div class="stats-card"{style}>
+    <h3>{value}</h3>
+    <p>{label}</p>
+</div>
+"""
+
+
+_CARD_HEADER_TMPL = (
+    '<div style="background: white; padding: 2rem; border-radius: 15px; '
+    'box-shadow: 0 5px 20px rgba(0,0,0,0.08); margin-bottom: 1rem; border-left: 5px solid {color};">'
+    '<h3 style="color: {color}; margin-bottom: 1rem;">{title}</h3></div>'
+)
+
+
+def card_header(title: str, color: str) -> None:
+    """White card with a coloured left border used as a section header"""
+    st.markdown(_CARD_HEADER_TMPL.format(title=title, color=color), unsafe_allow_html=True)
+
+
 def create_resume_preview_section():
     """Create a resume preview section with sample images"""
-    st.markdown("### ✨ Professional Resume Templates")
-    st.markdown("*Our AI creates modern, ATS-friendly resumes that get noticed*")
-    
-    # Create three columns for resume templates
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%); 
-                    width: 100%; height: 280px; border-radius: 10px; 
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    display: flex; flex-direction: column; padding: 1rem; margin-bottom: 1rem;">
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                        height: 40px; border-radius: 5px; margin-bottom: 1rem;
-                        display: flex; align-items: center; justify-content: center; color: white; font-weight: bold;">
-                John Doe
-            </div>
-            <div style="background: #e9ecef; height: 8px; border-radius: 4px; margin-bottom: 0.5rem;"></div>
-            <div style="background: #e9ecef; height: 8px; border-radius: 4px; margin-bottom: 0.5rem; width: 80%;"></div>
-            <div style="background: #e9ecef; height: 8px; border-radius: 4px; margin-bottom: 1rem; width: 60%;"></div>
-            <div style="background: #667eea; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.7;"></div>
-            <div style="background: #e9ecef; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #e9ecef; height: 6px; border-radius: 3px; margin-bottom: 0.3rem; width: 90%;"></div>
-            <div style="background: #e9ecef; height: 6px; border-radius: 3px; margin-bottom: 1rem; width: 70%;"></div>
-            <div style="background: #764ba2; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.7;"></div>
-            <div style="background: #e9ecef; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #e9ecef; height: 6px; border-radius: 3px; width: 85%;"></div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #fff8f0 0%, #ffe8d0 100%); 
-                    width: 100%; height: 280px; border-radius: 10px; 
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    display: flex; flex-direction: column; padding: 1rem; margin-bottom: 1rem;">
-            <div style="background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%); 
-                        height: 40px; border-radius: 5px; margin-bottom: 1rem;
-                        display: flex; align-items: center; justify-content: center; color: white; font-weight: bold;">
-                Jane Smith
-            </div>
-            <div style="background: #FFE0B2; height: 8px; border-radius: 4px; margin-bottom: 0.5rem;"></div>
-            <div style="background: #FFE0B2; height: 8px; border-radius: 4px; margin-bottom: 0.5rem; width: 75%;"></div>
-            <div style="background: #FFE0B2; height: 8px; border-radius: 4px; margin-bottom: 1rem; width: 90%;"></div>
-            <div style="background: #FF9800; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.8;"></div>
-            <div style="background: #FFE0B2; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #FFE0B2; height: 6px; border-radius: 3px; margin-bottom: 0.3rem; width: 95%;"></div>
-            <div style="background: #FFE0B2; height: 6px; border-radius: 3px; margin-bottom: 1rem; width: 80%;"></div>
-            <div style="background: #F57C00; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.8;"></div>
-            <div style="background: #FFE0B2; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #FFE0B2; height: 6px; border-radius: 3px; width: 88%;"></div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div style="background: linear-gradient(135deg, #f0f8ff 0%, #e0f0ff 100%); 
-                    width: 100%; height: 280px; border-radius: 10px; 
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    display: flex; flex-direction: column; padding: 1rem; margin-bottom: 1rem;">
-            <div style="background: linear-gradient(135deg, #2196F3 0%, #1976D2 100%); 
-                        height: 40px; border-radius: 5px; margin-bottom: 1rem;
-                        display: flex; align-items: center; justify-content: center; color: white; font-weight: bold;">
-                Alex Johnson
-            </div>
-            <div style="background: #BBDEFB; height: 8px; border-radius: 4px; margin-bottom: 0.5rem;"></div>
-            <div style="background: #BBDEFB; height: 8px; border-radius: 4px; margin-bottom: 0.5rem; width: 85%;"></div>
-            <div style="background: #BBDEFB; height: 8px; border-radius: 4px; margin-bottom: 1rem; width: 70%;"></div>
-            <div style="background: #2196F3; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.8;"></div>
-            <div style="background: #BBDEFB; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #BBDEFB; height: 6px; border-radius: 3px; margin-bottom: 0.3rem; width: 92%;"></div>
-            <div style="background: #BBDEFB; height: 6px; border-radius: 3px; margin-bottom: 1rem; width: 75%;"></div>
-            <div style="background: #1976D2; height: 20px; border-radius: 3px; margin-bottom: 0.5rem; opacity: 0.8;"></div>
-            <div style="background: #BBDEFB; height: 6px; border-radius: 3px; margin-bottom: 0.3rem;"></div>
-            <div style="background: #BBDEFB; height: 6px; border-radius: 3px; width: 87%;"></div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("### ✨ Professional Resume Templates\n*Our AI creates modern, ATS-friendly resumes that get noticed*")
+
+    for col, (name, (bg1, bg2), (c1, c2), line, opacity, widths) in zip(st.columns(3), TEMPLATE_CARDS):
+        with col:
+            st.markdown(
+                _CARD_TMPL.format(name=name, bg1=bg1, bg2=bg2, c1=c1, c2=c2, line=line, opacity=opacity, w=widths),
+                unsafe_allow_html=True,
+            )
+
+
+def show_stats_cards():
+    """Render the Welcome page stats cards as a single markdown block"""
+    html = "".join(
+        _STATS_TMPL.format(style=f' style="background: {background};"' if background else "", value=value, label=label)
+        for value, label, background in STATS_CARDS
+    )
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def _mark_rerun() -> None:
+    """Request a rerun; main() issues at most one after the page is rendered"""
+    st.session_state["_pending_rerun"] = True
 
 
 def dynamic_list_input(label: str, key: str, placeholder: str = "", help_text: str = None) -> List[str]:
     """Create a dynamic list input with add/remove buttons"""
-    if f"{key}_items" not in st.session_state:
-        st.session_state[f"{key}_items"] = [""]
+    items_key = f"{key}_items"
+    st.session_state.setdefault(items_key, [""])
     
     st.markdown(f"**{label}**")
     if help_text:
         st.markdown(f"*{help_text}*")
     
     items = []
+    remove_idx = None
     
-    for i, item in enumerate(st.session_state[f"{key}_items"]):
+    for i, item in enumerate(st.session_state[items_key]):
         col1, col2 = st.columns([4, 1])
         with col1:
-            value = st.text_input(f"{label} {i+1}", value=item, key=f"{key}_input_{i}", placeholder=placeholder)
-            if value.strip():
-                items.append(value.strip())
+            value = st.text_input(f"{label} {i+1}", value=item, key=f"{key}_input_{i}", placeholder=placeholder).strip()
+            if value:
+                items.append(value)
         with col2:
             if st.button("❌", key=f"{key}_remove_{i}", help="Remove this item"):
-                st.session_state[f"{key}_items"].pop(i)
-                st.rerun()
+                remove_idx = i
     
-    if st.button(f"➕ Add {label}", key=f"{key}_add"):
-        st.session_state[f"{key}_items"].append("")
-        st.rerun()
+    if remove_idx is not None:
+        st.session_state[items_key].pop(remove_idx)
+        _mark_rerun()
     
-    st.session_state[f"{key}_items"] = [item for item in st.session_state[f"{key}_items"] if True]
+    if st.button(f"➕ Add {label}", key=f"{key}_add"):
+        st.session_state[items_key].append("")
+        _mark_rerun()
     
     return items
 
 
+# Dynamic sections keep their rows column-wise in session_state: one list per
+# field, so adding or removing a row is one append/pop per column.
+_EXPERIENCE_FIELDS = {"title": "", "company": "", "location": "", "start": "", "end": "", "bullets": ()}
+_EDUCATION_FIELDS = {"degree": "", "school": "", "location": "", "year": "", "details": ()}
+_PROJECT_FIELDS = {"name": "", "description": "", "tech": ()}
+
+
+def _soa_state(key: str, fields: Dict[str, Any]) -> Dict[str, list]:
+    """Return the column store for a dynamic section, starting with one empty row"""
+    return st.session_state.setdefault(key, {f: [default] for f, default in fields.items()})
+
+
+def _soa_append(soa: Dict[str, list], fields: Dict[str, Any]) -> None:
+    for f, default in fields.items():
+        soa[f].append(default)
+
+
+# Widget key prefixes per section; row i's widgets are keyed f"{prefix}_{i}"
+_EXPERIENCE_KEYS = ("exp_title", "exp_company", "exp_start", "exp_location", "exp_end", "exp_bullets")
+_EDUCATION_KEYS = ("edu_degree", "edu_school", "edu_year", "edu_location", "edu_details")
+_PROJECT_KEYS = ("proj_name", "proj_desc", "proj_tech")
+
+
+def _remove_row(soa_key: str, i: int, widget_keys: Tuple[str, ...]) -> None:
+    """Remove row i and shift the later rows up, widget state included, so the
+    entries keep the order the user gave them (and the PDF prints).
+
+    Runs as an on_click callback, before any widget is instantiated, so the
+    widget values can be moved along with the columns.
+    """
+    soa = st.session_state[soa_key]
+    last = len(next(iter(soa.values()))) - 1
+    for column in soa.values():
+        column.pop(i)
+    for prefix in widget_keys:
+        for j in range(i, last):
+            moved = st.session_state.pop(f"{prefix}_{j + 1}", None)
+            if moved is None:
+                st.session_state.pop(f"{prefix}_{j}", None)
+            else:
+                st.session_state[f"{prefix}_{j}"] = moved
+        st.session_state.pop(f"{prefix}_{last}", None)
+
+
+# Each row is a fragment, so typing in one row reruns only that row's widgets.
+# st.fragment is stable from Streamlit 1.37; 1.33-1.36 ship it as experimental.
+_fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@_fragment
+def _experience_row(i: int) -> Optional[Dict[str, Any]]:
+    soa = st.session_state["experience_soa"]
+    if i >= len(soa["title"]):
+        st.rerun()  # this was the last row and was just removed
+    st.markdown(f"**🏢 Experience {i+1}**")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        title = st.text_input("Job Title", value=soa["title"][i], key=f"exp_title_{i}")
+        company = st.text_input("Company", value=soa["company"][i], key=f"exp_company_{i}")
+        start_date = st.text_input("Start Date", value=soa["start"][i], key=f"exp_start_{i}", 
+                                 placeholder="e.g., Jan 2022")
+    
+    with col2:
+        location = st.text_input("Location", value=soa["location"][i], key=f"exp_location_{i}")
+        end_date = st.text_input("End Date", value=soa["end"][i], key=f"exp_end_{i}", 
+                               placeholder="e.g., Present")
+    
+    bullets_text = st.text_area("Key Achievements & Responsibilities", 
+                               value="\n".join(soa["bullets"][i]), 
+                               key=f"exp_bullets_{i}",
+                               placeholder="• Increased sales by 25% through strategic initiatives\n• Led a team of 5 developers\n• Implemented new processes",
+                               height=100)
+    
+    bullets = _split_bullets(bullets_text)
+    
+    col1, col2 = st.columns(2)
+    with col2:
+        if st.button(f"❌ Remove Experience {i+1}", key=f"exp_remove_{i}",
+                     on_click=_remove_row, args=("experience_soa", i, _EXPERIENCE_KEYS)):
+            # Removing a row changes the whole section, so rerun the full app
+            st.rerun()
+    
+    if title or company or bullets:
+        return {
+            "title": title,
+            "company": company,
+            "location": location,
+            "start": start_date,
+            "end": end_date,
+            "bullets": bullets
+        }
+    return None
+
+
 def dynamic_experience_input() -> List[Dict[str, Any]]:
     """Create dynamic experience section input"""
-    if "experience_items" not in st.session_state:
-        st.session_state["experience_items"] = [{}]
+    rows = len(_soa_state("experience_soa", _EXPERIENCE_FIELDS)["title"])
     
     experiences = []
     
-    for i, exp in enumerate(st.session_state["experience_items"]):
-        st.markdown(f"**🏢 Experience {i+1}**")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            title = st.text_input("Job Title", value=exp.get("title", ""), key=f"exp_title_{i}")
-            company = st.text_input("Company", value=exp.get("company", ""), key=f"exp_company_{i}")
-            start_date = st.text_input("Start Date", value=exp.get("start", ""), key=f"exp_start_{i}", 
-                                     placeholder="e.g., Jan 2022")
-        
-        with col2:
-            location = st.text_input("Location", value=exp.get("location", ""), key=f"exp_location_{i}")
-            end_date = st.text_input("End Date", value=exp.get("end", ""), key=f"exp_end_{i}", 
-                                   placeholder="e.g., Present")
-        
-        bullets_text = st.text_area("Key Achievements & Responsibilities", 
-                                   value="\n".join(exp.get("bullets", [])), 
-                                   key=f"exp_bullets_{i}",
-                                   placeholder="• Increased sales by 25% through strategic initiatives\n• Led a team of 5 developers\n• Implemented new processes",
-                                   height=100)
+    for i in range(rows):
+        exp = _experience_row(i)
+        if exp:
+            experiences.append(exp)
         
-        bullets = [b.strip() for b in bullets_text.split('\n') if b.strip()]
-        
-        if title or company or bullets:
-            experiences.append({
-                "title": title,
-                "company": company,
-                "location": location,
-                "start": start_date,
-                "end": end_date,
-                "bullets": bullets
-            })
-        
-        col1, col2 = st.columns(2)
-        with col2:
-            if st.button(f"❌ Remove Experience {i+1}", key=f"exp_remove_{i}"):
-                st.session_state["experience_items"].pop(i)
-                st.rerun()
-        
-        if i < len(st.session_state["experience_items"]) - 1:
+        if i < rows - 1:
             st.divider()
     
     if st.button("➕ Add Another Experience"):
-        st.session_state["experience_items"].append({})
-        st.rerun()
+        _soa_append(st.session_state["experience_soa"], _EXPERIENCE_FIELDS)
+        _mark_rerun()
     
     return experiences
 
 
+@_fragment
+def _education_row(i: int) -> Optional[Dict[str, Any]]:
+    soa = st.session_state["education_soa"]
+    if i >= len(soa["degree"]):
+        st.rerun()  # this was the last row and was just removed
+    st.markdown(f"**🎓 Education {i+1}**")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        degree = st.text_input("Degree", value=soa["degree"][i], key=f"edu_degree_{i}")
+        school = st.text_input("School/University", value=soa["school"][i], key=f"edu_school_{i}")
+    
+    with col2:
+        year = st.text_input("Year", value=soa["year"][i], key=f"edu_year_{i}", placeholder="e.g., 2020")
+        location = st.text_input("Location", value=soa["location"][i], key=f"edu_location_{i}")
+    
+    details_text = st.text_area("Additional Details", 
+                               value="\n".join(soa["details"][i]), 
+                               key=f"edu_details_{i}",
+                               placeholder="• GPA: 3.8/4.0\n• Relevant Coursework: Data Structures, Algorithms\n• Dean's List",
+                               height=80)
+    
+    details = _split_bullets(details_text)
+    
+    col1, col2 = st.columns(2)
+    with col2:
+        if st.button(f"❌ Remove Education {i+1}", key=f"edu_remove_{i}",
+                     on_click=_remove_row, args=("education_soa", i, _EDUCATION_KEYS)):
+            # Removing a row changes the whole section, so rerun the full app
+            st.rerun()
+    
+    if degree or school:
+        return {
+            "degree": degree,
+            "school": school,
+            "location": location,
+            "year": year,
+            "details": details
+        }
+    return None
+
+
 def dynamic_education_input() -> List[Dict[str, Any]]:
     """Create dynamic education section input"""
-    if "education_items" not in st.session_state:
-        st.session_state["education_items"] = [{}]
+    rows = len(_soa_state("education_soa", _EDUCATION_FIELDS)["degree"])
     
     education = []
     
-    for i, edu in enumerate(st.session_state["education_items"]):
-        st.markdown(f"**🎓 Education {i+1}**")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            degree = st.text_input("Degree", value=edu.get("degree", ""), key=f"edu_degree_{i}")
-            school = st.text_input("School/University", value=edu.get("school", ""), key=f"edu_school_{i}")
-        
-        with col2:
-            year = st.text_input("Year", value=edu.get("year", ""), key=f"edu_year_{i}", placeholder="e.g., 2020")
-            location = st.text_input("Location", value=edu.get("location", ""), key=f"edu_location_{i}")
-        
-        details_text = st.text_area("Additional Details", 
-                                   value="\n".join(edu.get("details", [])), 
-                                   key=f"edu_details_{i}",
-                                   placeholder="• GPA: 3.8/4.0\n• Relevant Coursework: Data Structures, Algorithms\n• Dean's List",
-                                   height=80)
-        
-        details = [d.strip() for d in details_text.split('\n') if d.strip()]
+    for i in range(rows):
+        edu = _education_row(i)
+        if edu:
+            education.append(edu)
         
-        if degree or school:
-            education.append({
-                "degree": degree,
-                "school": school,
-                "location": location,
-                "year": year,
-                "details": details
-            })
-        
-        col1, col2 = st.columns(2)
-        with col2:
-            if st.button(f"❌ Remove Education {i+1}", key=f"edu_remove_{i}"):
-                st.session_state["education_items"].pop(i)
-                st.rerun()
-        
-        if i < len(st.session_state["education_items"]) - 1:
+        if i < rows - 1:
             st.divider()
     
     if st.button("➕ Add Another Education"):
-        st.session_state["education_items"].append({})
-        st.rerun()
+        _soa_append(st.session_state["education_soa"], _EDUCATION_FIELDS)
+        _mark_rerun()
     
     return education
 
 
+@_fragment
+def _project_row(i: int) -> Optional[Dict[str, Any]]:
+    soa = st.session_state["project_soa"]
+    if i >= len(soa["name"]):
+        st.rerun()  # this was the last row and was just removed
+    st.markdown(f"**🚀 Project {i+1}**")
+    
+    name = st.text_input("Project Name", value=soa["name"][i], key=f"proj_name_{i}")
+    description = st.text_area("Description", value=soa["description"][i], key=f"proj_desc_{i}",
+                             placeholder="Brief description of the project, its purpose, and your role",
+                             height=80)
+    tech_text = st.text_input("Technologies Used", value=", ".join(soa["tech"][i]), 
+                            key=f"proj_tech_{i}",
+                            placeholder="React, Node.js, MongoDB, AWS")
+    
+    tech = [t.strip() for t in tech_text.split(',') if t.strip()]
+    
+    col1, col2 = st.columns(2)
+    with col2:
+        if st.button(f"❌ Remove Project {i+1}", key=f"proj_remove_{i}",
+                     on_click=_remove_row, args=("project_soa", i, _PROJECT_KEYS)):
+            # Removing a row changes the whole section, so rerun the full app
+            st.rerun()
+    
+    if name or description:
+        return {
+            "name": name,
+            "description": description,
+            "tech": tech
+        }
+    return None
+
+
 def dynamic_projects_input() -> List[Dict[str, Any]]:
     """Create dynamic projects section input"""
-    if "project_items" not in st.session_state:
-        st.session_state["project_items"] = [{}]
+    rows = len(_soa_state("project_soa", _PROJECT_FIELDS)["name"])
     
     projects = []
     
-    for i, proj in enumerate(st.session_state["project_items"]):
-        st.markdown(f"**🚀 Project {i+1}**")
-        
-        name = st.text_input("Project Name", value=proj.get("name", ""), key=f"proj_name_{i}")
-        description = st.text_area("Description", value=proj.get("description", ""), key=f"proj_desc_{i}",
-                                 placeholder="Brief description of the project, its purpose, and your role",
-                                 height=80)
-        tech_text = st.text_input("Technologies Used", value=", ".join(proj.get("tech", [])), 
-                                key=f"proj_tech_{i}",
-                                placeholder="React, Node.js, MongoDB, AWS")
+    for i in range(rows):
+        proj = _project_row(i)
+        if proj:
+            projects.append(proj)
         
-        tech = [t.strip() for t in tech_text.split(',') if t.strip()]
-        
-        if name or description:
-            projects.append({
-                "name": name,
-                "description": description,
-                "tech": tech
-            })
-        
-        col1, col2 = st.columns(2)
-        with col2:
-            if st.button(f"❌ Remove Project {i+1}", key=f"proj_remove_{i}"):
-                st.session_state["project_items"].pop(i)
-                st.rerun()
-        
-        if i < len(st.session_state["project_items"]) - 1:
+        if i < rows - 1:
             st.divider()
     
     if st.button("➕ Add Another Project"):
-        st.session_state["project_items"].append({})
-        st.rerun()
+        _soa_append(st.session_state["project_soa"], _PROJECT_FIELDS)
+        _mark_rerun()
     
     return projects
 
 
 def main() -> None:
+    inject_css()
+
     # Enhanced sidebar with colorful navigation
     st.sidebar.markdown("""
     <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
@@ -525,7 +533,7 @@ def main() -> None:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # Feature cards
+            # Feature cards, sent as one markdown block
             st.markdown("""
             <div class="feature-card matching">
                 <h3>🎯 Smart Resume Matching</h3>
@@ -537,9 +545,6 @@ def main() -> None:
                     <li>✅ Detailed PDF reports</li>
                 </ul>
             </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
             <div class="feature-card builder">
                 <h3>📝 Professional Resume Builder</h3>
                 <p>Create stunning, ATS-friendly resumes with our intelligent builder. Multiple templates, dynamic sections, and professional formatting that gets you noticed by recruiters.</p>
@@ -550,9 +555,6 @@ def main() -> None:
                     <li>✅ Instant PDF generation</li>
                 </ul>
             </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
             <div class="feature-card analytics">
                 <h3>📊 Advanced Analytics</h3>
                 <p>Deep insights into your resume performance. Multi-agent workflow provides explainable results with visual workflow diagrams and comprehensive analysis.</p>
@@ -570,26 +572,7 @@ def main() -> None:
             create_resume_preview_section()
             
             # Stats cards
-            st.markdown("""
-            <div class="stats-card">
-                <h3>95%</h3>
-                <p>Matching Accuracy</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="stats-card" style="background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);">
-                <h3>10K+</h3>
-                <p>Resumes Processed</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="stats-card" style="background: linear-gradient(135deg, #FF9800 0%, #F57C00 100%);">
-                <h3>24/7</h3>
-                <p>AI Availability</p>
-            </div>
-            """, unsafe_allow_html=True)
+            show_stats_cards()
 
         # Enhanced usage tips
         with st.expander("💡 Pro Tips for Maximum Success", expanded=False):
@@ -628,6 +611,9 @@ def main() -> None:
 
     # ----------------- RESUME MATCHING -----------------
     elif mode == "🎯 Resume Matching":
+        # Load and warm the embedding service while the user fills in the inputs
+        get_embedding_service()
+
         # Header for Resume Matching
         st.markdown("""
         <div style="background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); 
@@ -641,13 +627,7 @@ def main() -> None:
         col1, col2 = st.columns([1, 1])
 
         with col1:
-            st.markdown("""
-            <div style="background: white; padding: 2rem; border-radius: 15px; 
-                        box-shadow: 0 5px 20px rgba(0,0,0,0.08); margin-bottom: 1rem;
-                        border-left: 5px solid #4CAF50;">
-                <h3 style="color: #4CAF50; margin-bottom: 1rem;">📄 Upload Your Resume</h3>
-            </div>
-            """, unsafe_allow_html=True)
+            card_header("📄 Upload Your Resume", "#4CAF50")
             
             resume_file = st.file_uploader(
                 "Choose your resume file", 
@@ -664,13 +644,7 @@ def main() -> None:
                 """, unsafe_allow_html=True)
 
         with col2:
-            st.markdown("""
-            <div style="background: white; padding: 2rem; border-radius: 15px; 
-                        box-shadow: 0 5px 20px rgba(0,0,0,0.08); margin-bottom: 1rem;
-                        border-left: 5px solid #2196F3;">
-                <h3 style="color: #2196F3; margin-bottom: 1rem;">📋 Job Description</h3>
-            </div>
-            """, unsafe_allow_html=True)
+            card_header("📋 Job Description", "#2196F3")
             
             job_desc = st.text_area(
                 "Paste the complete job description", 
@@ -692,32 +666,33 @@ def main() -> None:
 
         # Progress and results section
         if run and resume_file and job_desc:
+            from src.agents import matcher_and_scoring_agent
+            from src.reporting import generate_pdf_report
+            from src.workflow import build_workflow_trace, workflow_figure
+            from src.ui_components import show_agent_outputs, show_match_summary, show_workflow_diagram
+
             # Progress indicator
             progress_bar = st.progress(0)
             status_text = st.empty()
             
             with st.spinner("🤖 Our AI agents are analyzing your resume..."):
-                embed = EmbeddingService()
+                embed = get_embedding_service()
                 steps = []
 
-                # Step 1: Resume parsing
-                status_text.text("📄 Parsing resume content...")
-                progress_bar.progress(20)
+                # Steps 1-3: Resume and job parsing run concurrently; the
+                # enhancer starts as soon as the resume text is available.
+                status_text.text("📄 Parsing resume and job description...")
                 resume_bytes = resume_file.getvalue()
-                a1 = resume_parser_agent(resume_bytes)
-                steps.append(a1)
+                done = []
 
-                # Step 2: Job parsing
-                status_text.text("📋 Analyzing job description...")
-                progress_bar.progress(40)
-                a2 = job_parser_agent(job_desc)
-                steps.append(a2)
+                def on_step(name: str) -> None:
+                    done.append(name)
+                    progress_bar.progress(20 * len(done))
+                    if name == "resume":
+                        status_text.text("✨ Enhancing content analysis...")
 
-                # Step 3: Content enhancement
-                status_text.text("✨ Enhancing content analysis...")
-                progress_bar.progress(60)
-                a3 = content_enhancer_agent(a1.outputs["raw_text"])
-                steps.append(a3)
+                a1, a2, a3 = asyncio.run(_run_parsing_agents(resume_bytes, job_desc, on_step))
+                steps.extend((a1, a2, a3))
 
                 # Step 4: Matching and scoring
                 status_text.text("🎯 Calculating match score and recommendations...")
@@ -850,7 +825,7 @@ def main() -> None:
                     "email": email,
                     "phone": phone,
                     "location": location,
-                    "links": [ln.strip() for ln in (links.splitlines() if links else []) if ln.strip()],
+                    "links": _split_bullets(links),
                 })
 
             # Photo Upload
@@ -920,7 +895,7 @@ def main() -> None:
                 certifications_text = st.text_area("Certifications",
                                                   placeholder="AWS Certified Solutions Architect\nGoogle Cloud Professional Data Engineer\nCertified Kubernetes Administrator (CKA)",
                                                   help="One certification per line")
-                data["certifications"] = [c.strip() for c in (certifications_text.splitlines() if certifications_text else []) if c.strip()]
+                data["certifications"] = _split_bullets(certifications_text)
 
         with col2:
             # Preview section and tips
@@ -970,6 +945,7 @@ def main() -> None:
             
             with st.spinner("🎨 Creating your professional resume..."):
                 try:
+                    from src.reporting import generate_ats_resume_pdf
                     resume_pdf = generate_ats_resume_pdf(data)
                     dl_name = (data.get("name", "resume")).replace(" ", "_").lower() + "_professional_resume.pdf"
                     
@@ -1041,6 +1017,9 @@ def main() -> None:
                 - Test PDF rendering on different devices
                 """)
 
+    if st.session_state.pop("_pending_rerun", False):
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file